@@ -60,6 +60,9 @@ async def setup_ttl_indexes():
         await app_errors_collection.create_index("app_id", background=True)
         await app_health_checks_collection.create_index("app_id", background=True)
         
+        # Per-user app lookups, including by name
+        await apps_collection.create_index([("user_id", 1), ("name", 1)], background=True)
+
         # Compound index for recent health checks per app
         await app_health_checks_collection.create_index(
             [("app_id", 1), ("timestamp", -1)],
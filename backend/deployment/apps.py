@@ -15,6 +15,8 @@ from .helpers import get_user_mongo_uri_secure, create_or_update_resource, creat
 logger = logging.getLogger(__name__)
 
 RUNNER_IMAGE = os.getenv("RUNNER_IMAGE", "ghcr.io/thatcatxedo/fastapi-platform-runner:latest")
+# Where the runner keeps compiled user code (CODE_CACHE_DIR), on an emptyDir
+CODE_CACHE_PATH = "/code-cache"
 
 
 def get_app_labels(user_id: str, app_id: str) -> dict:
@@ -109,6 +111,7 @@ async def create_deployment(app_doc: dict, user: dict):
         k8s_client.V1EnvVar(name="CODE_PATH", value=code_path),
         k8s_client.V1EnvVar(name="PLATFORM_MONGO_URI", value=mongo_uri),
         k8s_client.V1EnvVar(name="APP_ID", value=app_id),
+        k8s_client.V1EnvVar(name="CODE_CACHE_DIR", value=CODE_CACHE_PATH),
     ]
     # Add user-defined env vars
     if app_doc.get("env_vars"):
@@ -124,6 +127,10 @@ async def create_deployment(app_doc: dict, user: dict):
             k8s_client.V1VolumeMount(
                 name="code",
                 mount_path="/code"
+            ),
+            k8s_client.V1VolumeMount(
+                name="code-cache",
+                mount_path=CODE_CACHE_PATH
             )
         ],
         env=env_list,
@@ -157,6 +164,13 @@ async def create_deployment(app_doc: dict, user: dict):
         )
     )
 
+    # Scratch volume for the runner's compiled-code cache; an emptyDir
+    # outlives container restarts within the pod, unlike the container's /tmp
+    cache_volume = k8s_client.V1Volume(
+        name="code-cache",
+        empty_dir=k8s_client.V1EmptyDirVolumeSource(size_limit="16Mi")
+    )
+
     # Pod template
     pod_template = k8s_client.V1PodTemplateSpec(
         metadata=k8s_client.V1ObjectMeta(
@@ -168,7 +182,7 @@ async def create_deployment(app_doc: dict, user: dict):
         ),
         spec=k8s_client.V1PodSpec(
             containers=[container],
-            volumes=[volume],
+            volumes=[volume, cache_volume],
             image_pull_secrets=[k8s_client.V1LocalObjectReference(name="ghcr-auth")]
         )
     )
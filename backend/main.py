@@ -6,6 +6,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 from lifespan import lifespan
+from middleware import GzipRequestMiddleware
 from database import client, templates_collection
 from routers import auth, apps, viewer, database, databases, templates, admin, metrics
 
@@ -20,6 +21,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inflate gzip-encoded request bodies (large CLI deploys)
+app.add_middleware(GzipRequestMiddleware)
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(apps.router)
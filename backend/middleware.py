@@ -0,0 +1,69 @@
+"""
+ASGI middleware for FastAPI Platform.
+"""
+import zlib
+
+from starlette.responses import JSONResponse
+
+# Upper bound on an inflated request body; deploy payloads are capped at
+# 500KB of source by validation, so this leaves ample room for JSON overhead
+MAX_DECOMPRESSED_BODY = 4 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """Inflate request bodies sent with `Content-Encoding: gzip`.
+
+    The CLI gzips large deploy payloads; handlers downstream see a plain
+    JSON body with the encoding header removed and content-length fixed up.
+    """
+
+    def __init__(self, app, max_size: int = MAX_DECOMPRESSED_BODY):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_gzip(scope):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = inflater.decompress(b"".join(chunks), self.max_size)
+        except zlib.error:
+            await JSONResponse({"detail": "Invalid gzip request body"}, status_code=400)(scope, receive, send)
+            return
+        if inflater.unconsumed_tail:
+            await JSONResponse({"detail": "Request body too large"}, status_code=413)(scope, receive, send)
+            return
+
+        headers = [
+            (key, value) for key, value in scope["headers"]
+            if key not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = dict(scope, headers=headers)
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
+
+    @staticmethod
+    def _is_gzip(scope) -> bool:
+        for key, value in scope["headers"]:
+            if key == b"content-encoding":
+                return value.strip().lower() == b"gzip"
+        return False
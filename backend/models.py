@@ -291,6 +291,13 @@ class AppEventsResponse(BaseModel):
     error: Optional[str] = None
 
 
+class AppStatusBundleResponse(BaseModel):
+    """App, deploy status and recent events in one round trip."""
+    app: AppResponse
+    deploy_status: AppDeployStatusResponse
+    events: List[K8sEvent]
+
+
 # Observability models (Phase 1e)
 
 class AppMetricsResponse(BaseModel):
@@ -4,16 +4,18 @@ App management routes for FastAPI Platform.
 This module contains thin HTTP handlers that delegate to AppService
 for all business logic.
 """
-from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, WebSocket, WebSocketDisconnect
 from typing import List, Optional
 import asyncio
+import hashlib
+import json
 import logging
 
 from models import (
     AppCreate, AppUpdate, AppResponse, AppDetailResponse, AppStatusResponse,
     AppDeployStatusResponse, ValidateRequest, AppLogsResponse, AppEventsResponse,
     LogLine, K8sEvent, DraftUpdate, VersionEntry, VersionHistoryResponse,
-    ProxyRequest, ProxyResponse
+    ProxyRequest, ProxyResponse, AppStatusBundleResponse
 )
 from auth import get_current_user
 from utils import error_payload
@@ -57,10 +59,24 @@ def handle_service_error(e: AppServiceError) -> HTTPException:
 # =============================================================================
 
 @router.get("", response_model=List[AppResponse])
-async def list_apps(user: dict = Depends(get_current_user)):
-    """List all apps for the current user."""
-    apps = await app_service.list_for_user(user)
-    return [app_service.to_response(app) for app in apps]
+async def list_apps(
+    request: Request,
+    name: Optional[str] = Query(None, description="Only return the app with this name"),
+    user: dict = Depends(get_current_user),
+):
+    """List all apps for the current user, optionally filtered by name.
+
+    The body carries a content-hash ETag so clients polling the list can
+    revalidate with If-None-Match and get an empty 304 when nothing changed.
+    """
+    apps = await app_service.list_for_user(user, name=name)
+    payload = [app_service.to_response(app).model_dump() for app in apps]
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.post("", response_model=AppResponse)
@@ -172,14 +188,8 @@ async def get_app_status(app_id: str, user: dict = Depends(get_current_user)):
     )
 
 
-@router.get("/{app_id}/deploy-status", response_model=AppDeployStatusResponse)
-async def get_app_deploy_status(app_id: str, user: dict = Depends(get_current_user)):
-    """Get detailed deployment status for an app."""
-    try:
-        app = await app_service.get_by_app_id(app_id, user)
-    except AppServiceError as e:
-        raise handle_service_error(e)
-
+async def _build_deploy_status(app: dict, user: dict) -> AppDeployStatusResponse:
+    """Combine the stored deploy state with the live Kubernetes status."""
     pod_status = None
     deployment_ready = False
 
@@ -201,6 +211,41 @@ async def get_app_deploy_status(app_id: str, user: dict = Depends(get_current_us
     )
 
 
+@router.get("/{app_id}/deploy-status", response_model=AppDeployStatusResponse)
+async def get_app_deploy_status(app_id: str, user: dict = Depends(get_current_user)):
+    """Get detailed deployment status for an app."""
+    try:
+        app = await app_service.get_by_app_id(app_id, user)
+    except AppServiceError as e:
+        raise handle_service_error(e)
+
+    return await _build_deploy_status(app, user)
+
+
+@router.get("/{app_id}/status-bundle", response_model=AppStatusBundleResponse)
+async def get_app_status_bundle(
+    app_id: str,
+    limit: int = 5,
+    user: dict = Depends(get_current_user)
+):
+    """Get app, deploy status and recent events in a single request."""
+    try:
+        app = await app_service.get_by_app_id(app_id, user)
+    except AppServiceError as e:
+        raise handle_service_error(e)
+
+    deploy_status, events = await asyncio.gather(
+        _build_deploy_status(app, user),
+        get_app_events(app_id, limit)
+    )
+
+    return AppStatusBundleResponse(
+        app=app_service.to_response(app),
+        deploy_status=deploy_status,
+        events=[K8sEvent(**event) for event in events.get("events", [])]
+    )
+
+
 # =============================================================================
 # Validation
 # =============================================================================
@@ -441,7 +486,7 @@ async def stream_app_logs(websocket: WebSocket, app_id: str):
 
                 await websocket.send_json({"type": "connected", "pod_name": pod_name})
 
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 while True:
                     # Read line in executor to avoid blocking the event loop
                     line_bytes = await loop.run_in_executor(
@@ -484,6 +529,55 @@ async def stream_app_logs(websocket: WebSocket, app_id: str):
             pass
 
 
+# Server-side check interval and overall budget for deploy status streams
+DEPLOY_STREAM_INTERVAL = 1.0
+DEPLOY_STREAM_TIMEOUT = 180.0
+
+
+@router.websocket("/{app_id}/deploy/stream")
+async def stream_deploy_status(websocket: WebSocket, app_id: str):
+    """Push deploy status changes via WebSocket until the app is ready or fails.
+
+    Each message is {"type": "status", ...AppDeployStatusResponse fields}; it is
+    only sent when the status changes, and the socket closes after a terminal
+    state. Authentication is the same `token` query parameter as log streaming.
+    """
+    user = await _authenticate_websocket(websocket)
+    if not user:
+        return
+
+    try:
+        await app_service.get_by_app_id(app_id, user)
+    except AppServiceError:
+        await websocket.close(code=4004, reason="App not found")
+        return
+
+    await websocket.accept()
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DEPLOY_STREAM_TIMEOUT
+    last = None
+    try:
+        while loop.time() < deadline:
+            app = await app_service.get_by_app_id(app_id, user)
+            status = (await _build_deploy_status(app, user)).model_dump()
+            if status != last:
+                await websocket.send_json({"type": "status", **status})
+                last = status
+            if status["deployment_ready"] or status["status"] == "error":
+                break
+            await asyncio.sleep(DEPLOY_STREAM_INTERVAL)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Deploy status WebSocket disconnected for app {app_id}")
+    except Exception as e:
+        logger.error(f"Deploy status WebSocket error for app {app_id}: {e}")
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
 # =============================================================================
 # Test Panel Proxy
 # =============================================================================
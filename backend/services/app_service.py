@@ -289,18 +289,22 @@ class AppService:
             raise AppNotFoundError(app_id)
         return app
 
-    async def list_for_user(self, user: dict) -> List[dict]:
+    async def list_for_user(self, user: dict, name: Optional[str] = None) -> List[dict]:
         """
         List all non-deleted apps for a user.
 
         Args:
             user: User document
+            name: If given, only return apps with this name
 
         Returns:
             List of app documents
         """
+        query = {"user_id": user["_id"], "status": {"$ne": "deleted"}}
+        if name is not None:
+            query["name"] = name
         apps = []
-        async for app in self.apps.find({"user_id": user["_id"], "status": {"$ne": "deleted"}}):
+        async for app in self.apps.find(query):
             apps.append(app)
         return apps
 
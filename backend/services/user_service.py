@@ -4,6 +4,7 @@ User service for FastAPI Platform.
 This service handles user CRUD operations including signup, login validation,
 and MongoDB user provisioning.
 """
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
@@ -152,29 +153,36 @@ class UserService:
         }
         result = await self.users.insert_one(user_doc)
 
-        # Initialize settings on first signup
+        # Create per-user MongoDB credentials for default database
+        user_id = str(result.inserted_id)
+        pending = [self._provision_mongo_user(user_id, result.inserted_id, now)]
+
+        # Initialize settings on first signup. The settings upsert and the
+        # user-document update touch different collections, so they can't share
+        # a bulk_write; issue them concurrently instead of back to back.
         if is_first_user:
-            await self.settings.update_one(
+            pending.append(self.settings.update_one(
                 {"_id": "global"},
                 {"$setOnInsert": {
                     "allow_signups": True,
                     "updated_at": now
                 }},
                 upsert=True
-            )
-
-        # Create per-user MongoDB credentials for default database
-        user_id = str(result.inserted_id)
-        await self._provision_mongo_user(user_id, result.inserted_id, now)
+            ))
+        provisioned, *_ = await asyncio.gather(*pending)
 
-        return await self.users.find_one({"_id": result.inserted_id})
+        # Return the in-memory document instead of re-reading it
+        user_doc["_id"] = result.inserted_id
+        if provisioned:
+            user_doc.update(provisioned)
+        return user_doc
 
     async def _provision_mongo_user(
         self,
         user_id: str,
         inserted_id: ObjectId,
         created_at: datetime
-    ) -> None:
+    ) -> Optional[dict]:
         """
         Provision MongoDB user and viewer for a new platform user.
 
@@ -182,6 +190,9 @@ class UserService:
             user_id: String user ID
             inserted_id: ObjectId of inserted user
             created_at: Creation timestamp
+
+        Returns:
+            Fields written to the user document, or None if provisioning failed
         """
         from mongo_users import (
             create_mongo_user_for_database, create_viewer_user, encrypt_password
@@ -206,17 +217,20 @@ class UserService:
             }
 
             # Store database entry and viewer password in user document
+            provisioned = {
+                "databases": [default_db_entry],
+                "viewer_password_encrypted": encrypt_password(viewer_password)
+            }
             await self.users.update_one(
                 {"_id": inserted_id},
-                {"$set": {
-                    "databases": [default_db_entry],
-                    "viewer_password_encrypted": encrypt_password(viewer_password)
-                }}
+                {"$set": provisioned}
             )
             logger.info(f"Created MongoDB user {mongo_username} and viewer for platform user {user_id}")
+            return provisioned
         except Exception as e:
             # Log error but don't fail signup - user can still use platform without MongoDB access
             logger.error(f"Failed to create MongoDB user for {user_id}: {e}")
+            return None
 
     # =========================================================================
     # Login Validation
@@ -7,12 +7,15 @@ import yaml
 import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 logger = logging.getLogger("uvicorn")
 
 TEMPLATES_DIR = Path(__file__).parent / "global"
 
+_COMPLEXITIES = frozenset({"simple", "medium", "complex"})
+_MODES = frozenset({"single", "multi"})
+
 
 class TemplateData(BaseModel):
     """Validated template data from YAML files."""
@@ -22,35 +25,39 @@ class TemplateData(BaseModel):
     tags: List[str]
     mode: str = "single"
     # Single-file templates
-    code: Optional[str] = None
+    code: Optional[str] = Field(default=None, validate_default=True)
     # Multi-file templates
     framework: Optional[str] = None
     entrypoint: Optional[str] = None
-    files: Optional[Dict[str, str]] = None
+    files: Optional[Dict[str, str]] = Field(default=None, validate_default=True)
     # Database requirement indicator
     requires_database: bool = False
 
-    @validator("complexity")
+    @field_validator("complexity")
+    @classmethod
     def validate_complexity(cls, v):
-        if v not in ("simple", "medium", "complex"):
+        if v not in _COMPLEXITIES:
             raise ValueError(f"complexity must be one of: simple, medium, complex")
         return v
 
-    @validator("mode")
+    @field_validator("mode")
+    @classmethod
     def validate_mode(cls, v):
-        if v not in ("single", "multi"):
+        if v not in _MODES:
             raise ValueError(f"mode must be one of: single, multi")
         return v
 
-    @validator("code", always=True)
-    def validate_code_for_single(cls, v, values):
-        if values.get("mode") == "single" and not v:
+    @field_validator("code")
+    @classmethod
+    def validate_code_for_single(cls, v, info: ValidationInfo):
+        if info.data.get("mode") == "single" and not v:
             raise ValueError("single-file templates must have code")
         return v
 
-    @validator("files", always=True)
-    def validate_files_for_multi(cls, v, values):
-        if values.get("mode") == "multi" and not v:
+    @field_validator("files")
+    @classmethod
+    def validate_files_for_multi(cls, v, info: ValidationInfo):
+        if info.data.get("mode") == "multi" and not v:
             raise ValueError("multi-file templates must have files")
         return v
 
@@ -61,7 +68,7 @@ def load_template_from_yaml(yaml_path: Path) -> Optional[TemplateData]:
         with open(yaml_path, "r", encoding="utf-8") as f:
             data = yaml.safe_load(f)
 
-        template = TemplateData(**data)
+        template = TemplateData.model_validate(data)
         return template
     except Exception as e:
         logger.error(f"Failed to load template from {yaml_path.name}: {e}")
@@ -89,29 +96,13 @@ def load_global_templates(templates_dir: Path = TEMPLATES_DIR) -> List[Dict[str,
     for yaml_file in yaml_files:
         template_data = load_template_from_yaml(yaml_file)
         if template_data:
-            # Convert to dict for MongoDB
-            template_dict = {
-                "name": template_data.name,
-                "description": template_data.description,
-                "complexity": template_data.complexity,
-                "tags": template_data.tags,
-                "mode": template_data.mode,
-                "requires_database": template_data.requires_database,
-                "is_global": True,
-                "user_id": None,
-            }
-
-            # Add mode-specific fields
+            # Convert to dict for MongoDB, nulling fields of the other mode
+            template_dict = template_data.model_dump()
             if template_data.mode == "single":
-                template_dict["code"] = template_data.code
-                template_dict["files"] = None
-                template_dict["framework"] = None
-                template_dict["entrypoint"] = None
+                template_dict.update(files=None, framework=None, entrypoint=None)
             else:
                 template_dict["code"] = None
-                template_dict["files"] = template_data.files
-                template_dict["framework"] = template_data.framework
-                template_dict["entrypoint"] = template_data.entrypoint
+            template_dict.update(is_global=True, user_id=None)
 
             templates.append(template_dict)
             logger.debug(f"Loaded template: {template_data.name}")
@@ -39,23 +39,46 @@ def friendly_k8s_error(error_msg: str) -> str:
     return error_msg
 
 
+def _serialize_scalar(value: Any) -> Any:
+    """Convert a single non-container BSON value to its JSON-serializable form."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, Decimal128):
+        return str(value)
+    return value
+
+
 def serialize_mongo_doc(doc: Any) -> Any:
     """
-    Recursively convert a MongoDB document to a JSON-serializable dict.
+    Convert a MongoDB document to a JSON-serializable dict.
 
     Handles: ObjectId -> str, datetime -> ISO str, bytes -> base64 str,
-    Decimal128 -> str, and nested dicts/lists.
+    Decimal128 -> str, and nested dicts/lists. Nested containers are walked
+    with an explicit stack, so deep documents can't hit the recursion limit.
     """
     if isinstance(doc, dict):
-        return {k: serialize_mongo_doc(v) for k, v in doc.items()}
-    if isinstance(doc, list):
-        return [serialize_mongo_doc(item) for item in doc]
-    if isinstance(doc, ObjectId):
-        return str(doc)
-    if isinstance(doc, datetime):
-        return doc.isoformat()
-    if isinstance(doc, bytes):
-        return base64.b64encode(doc).decode("ascii")
-    if isinstance(doc, Decimal128):
-        return str(doc)
-    return doc
+        root = {}
+    elif isinstance(doc, list):
+        root = [None] * len(doc)
+    else:
+        return _serialize_scalar(doc)
+
+    stack = [(doc, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, dict):
+                child = {}
+                stack.append((value, child))
+            elif isinstance(value, list):
+                child = [None] * len(value)
+                stack.append((value, child))
+            else:
+                child = _serialize_scalar(value)
+            target[key] = child
+    return root
@@ -1,6 +1,57 @@
 """HTTP client for the FastAPI Platform API."""
 
-import httpx
+import gzip
+import json
+from collections.abc import Iterator
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from ..config import CONFIG_DIR
+
+# json_loads is shared with the commands that decode platform messages
+# themselves (log and status streams); orjson when installed
+try:
+    from orjson import dumps as _json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+if TYPE_CHECKING:
+    import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2 = find_spec("h2") is not None
+
+# Code payloads at least this large are gzipped on the wire
+GZIP_MIN_BYTES = 16 * 1024
+
+# ETag-validated GET responses, shared across CLI invocations
+ETAG_CACHE_FILE = CONFIG_DIR / "etag-cache.json"
+
+
+def _load_etag_cache() -> dict:
+    try:
+        return json.loads(ETAG_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_etag_cache(cache: dict) -> None:
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        ETAG_CACHE_FILE.write_text(json.dumps(cache))
+        ETAG_CACHE_FILE.chmod(0o600)
+    except OSError:
+        pass
 
 
 class PlatformError(Exception):
@@ -13,48 +64,113 @@ class PlatformError(Exception):
         super().__init__(message)
 
 
-def _parse_error(response: httpx.Response) -> PlatformError:
+def _parse_error(response: "httpx.Response") -> PlatformError:
     """Parse an error response into a PlatformError."""
+    status_code = response.status_code
     try:
-        data = response.json()
-    except Exception:
+        data = json_loads(response.content)
+    except ValueError:
+        return PlatformError(f"HTTP {status_code}: {response.text}", status_code=status_code)
+
+    # FastAPI errors look like {"detail": str} or {"detail": {"message", "code"}}
+    detail = data.get("detail", data) if type(data) is dict else data
+    detail_type = type(detail)
+    if detail_type is str:
+        return PlatformError(detail, status_code=status_code)
+    if detail_type is dict:
         return PlatformError(
-            f"HTTP {response.status_code}: {response.text}",
-            status_code=response.status_code,
+            detail.get("message", str(detail)),
+            status_code=status_code,
+            code=detail.get("code", ""),
         )
+    return PlatformError(str(data), status_code=status_code)
+
 
-    detail = data.get("detail", data)
-    if isinstance(detail, dict):
-        message = detail.get("message", str(detail))
-        code = detail.get("code", "")
-    elif isinstance(detail, str):
-        message = detail
-        code = ""
-    else:
-        message = str(data)
-        code = ""
+# Error text FastAPI returns when a request body isn't valid JSON: older
+# releases answer 400 with the first, newer ones 422 with json_invalid
+_BODY_DECODE_ERRORS = ("There was an error parsing the body", "json_invalid", "JSON decode error")
 
-    return PlatformError(message, status_code=response.status_code, code=code)
+
+def _is_undecodable_body(error: PlatformError) -> bool:
+    """True if the server rejected the request body as unreadable, not invalid."""
+    if error.status_code == 415:
+        return True
+    if error.status_code in (400, 422):
+        return any(marker in error.message for marker in _BODY_DECODE_ERRORS)
+    return False
 
 
 class PlatformClient:
     """Client for the FastAPI Platform API."""
 
     def __init__(self, base_url: str, token: str = ""):
+        # httpx dominates CLI import time; only load it once a client is needed
+        import httpx
+
         self._base_url = base_url.rstrip("/")
+        self._token = token
         self._client = httpx.Client(
             base_url=self._base_url,
             headers={"Authorization": f"Bearer {token}"} if token else {},
             timeout=30.0,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0),
         )
+        self._etag_cache: dict | None = None
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "PlatformClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _request(self, method: str, path: str, **kwargs) -> dict:
+        if method == "GET" and "params" not in kwargs:
+            return self._cached_get(path, **kwargs)
         response = self._client.request(method, path, **kwargs)
         if not response.is_success:
             raise _parse_error(response)
-        if response.status_code == 204:
-            return {}
-        return response.json()
+        return json_loads(response.content) if response.content else {}
+
+    def _send_payload(self, method: str, path: str, payload: dict) -> dict:
+        """Send a code payload as JSON, gzipped when it is large enough to pay off."""
+        body = _json_dumps(payload)
+        headers = {"Content-Type": "application/json"}
+        if len(body) >= GZIP_MIN_BYTES:
+            try:
+                return self._request(
+                    method, path, content=gzip.compress(body, 6),
+                    headers={**headers, "Content-Encoding": "gzip"},
+                )
+            except PlatformError as e:
+                # Platforms without request decompression can't read the body
+                if not _is_undecodable_body(e):
+                    raise
+        return self._request(method, path, content=body, headers=headers)
+
+    def _cached_get(self, path: str, **kwargs) -> dict:
+        """GET with If-None-Match revalidation against the on-disk cache."""
+        if self._etag_cache is None:
+            self._etag_cache = _load_etag_cache()
+        key = self._base_url + path
+        cached = self._etag_cache.get(key)
+        if cached:
+            kwargs.setdefault("headers", {})["If-None-Match"] = cached["etag"]
+
+        response = self._client.request("GET", path, **kwargs)
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        if not response.is_success:
+            raise _parse_error(response)
+        data = json_loads(response.content) if response.content else {}
+        etag = response.headers.get("etag")
+        if etag:
+            self._etag_cache[key] = {"etag": etag, "body": data}
+            _save_etag_cache(self._etag_cache)
+        return data
 
     # --- Auth ---
 
@@ -72,26 +188,51 @@ class PlatformClient:
 
     # --- Apps ---
 
-    def list_apps(self) -> list[dict]:
+    def list_apps(self, name: str | None = None) -> list[dict]:
+        if name is not None:
+            return self._request("GET", "/api/apps", params={"name": name})
         return self._request("GET", "/api/apps")
 
     def get_app(self, app_id: str) -> dict:
         return self._request("GET", f"/api/apps/{app_id}")
 
     def create_app(self, payload: dict) -> dict:
-        return self._request("POST", "/api/apps", json=payload)
+        return self._send_payload("POST", "/api/apps", payload)
 
     def update_app(self, app_id: str, payload: dict) -> dict:
-        return self._request("PUT", f"/api/apps/{app_id}", json=payload)
+        return self._send_payload("PUT", f"/api/apps/{app_id}", payload)
 
     def delete_app(self, app_id: str) -> dict:
         return self._request("DELETE", f"/api/apps/{app_id}")
 
     def save_draft(self, app_id: str, payload: dict) -> dict:
-        return self._request("PUT", f"/api/apps/{app_id}/draft", json=payload)
+        return self._send_payload("PUT", f"/api/apps/{app_id}/draft", payload)
+
+    def deploy_status(self, app_id: str, timeout: float | None = None) -> dict:
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        return self._request("GET", f"/api/apps/{app_id}/deploy-status", **kwargs)
+
+    def status_bundle(self, app_id: str, limit: int = 5) -> dict:
+        """App, deploy status and recent events in one round trip."""
+        return self._request(
+            "GET", f"/api/apps/{app_id}/status-bundle", params={"limit": limit}
+        )
+
+    def deploy_status_stream(self, app_id: str) -> Iterator[dict]:
+        """Yield deploy status updates pushed by the platform over WebSocket.
+
+        The server sends a message per status change and closes the socket
+        once the app is ready or has failed.
+        """
+        import websockets.sync.client as ws_client
 
-    def deploy_status(self, app_id: str) -> dict:
-        return self._request("GET", f"/api/apps/{app_id}/deploy-status")
+        ws_url = self._base_url.replace("https://", "wss://").replace("http://", "ws://")
+        url = f"{ws_url}/api/apps/{app_id}/deploy/stream?token={self._token}"
+        with ws_client.connect(url) as ws:
+            for message in ws:
+                data = json_loads(message)
+                if data.get("type") == "status":
+                    yield data
 
     def get_events(self, app_id: str, limit: int = 50) -> dict:
         return self._request(
@@ -106,6 +247,34 @@ class PlatformClient:
             params["since_seconds"] = since_seconds
         return self._request("GET", f"/api/apps/{app_id}/logs", params=params)
 
+    def stream_logs(
+        self, app_id: str, tail_lines: int = 100, since_seconds: int | None = None
+    ) -> Iterator[dict]:
+        """Yield log lines as they are decoded from the response body.
+
+        Needs ijson for incremental parsing; without it this falls back to
+        get_logs() and yields from the fully parsed response.
+        """
+        if ijson is None:
+            yield from self.get_logs(app_id, tail_lines, since_seconds).get("logs", [])
+            return
+
+        params: dict = {"tail_lines": tail_lines}
+        if since_seconds is not None:
+            params["since_seconds"] = since_seconds
+        with self._client.stream("GET", f"/api/apps/{app_id}/logs", params=params) as response:
+            if not response.is_success:
+                response.read()
+                raise _parse_error(response)
+            lines = ijson.sendable_list()
+            parser = ijson.items_coro(lines, "logs.item")
+            for chunk in response.iter_bytes():
+                parser.send(chunk)
+                yield from lines
+                del lines[:]
+            parser.close()
+            yield from lines
+
     def validate_code(self, payload: dict) -> dict:
         return self._request("POST", "/api/apps/validate", json=payload)
 
@@ -120,14 +289,56 @@ class PlatformClient:
         return self._request("GET", "/api/databases")
 
 
-def resolve_app(client: PlatformClient, name: str) -> dict:
-    """Find an app by name. Returns the app dict or exits with error."""
+@lru_cache(maxsize=4)
+def client_for(base_url: str, token: str = "") -> PlatformClient:
+    """Shared PlatformClient per (url, token), so one command reuses one pool."""
+    return PlatformClient(base_url, token)
+
+
+def _exit_unknown_apps(names: list[str]) -> None:
     from ..console import err_console
 
-    apps = client.list_apps()
-    matches = [a for a in apps if a["name"] == name]
-    if not matches:
+    for name in names:
         err_console.print(f"[red]No app named '{name}' found.[/red]")
-        err_console.print("Run [bold]fp list[/bold] to see your apps.")
-        raise SystemExit(1)
-    return matches[0]
+    err_console.print("Run [bold]fp list[/bold] to see your apps.")
+    raise SystemExit(1)
+
+
+@lru_cache(maxsize=4)
+def _get_app_domain(platform_url: str) -> str:
+    """Derive app domain from platform URL."""
+    host = urlparse(platform_url).hostname or ""
+    if host.startswith("platform."):
+        return host[len("platform."):]
+    return host
+
+
+def get_app_url(app_id: str, platform_url: str) -> str:
+    """Public URL of a deployed app on the given platform."""
+    return f"https://app-{app_id}.{_get_app_domain(platform_url)}"
+
+
+def resolve_app(client: PlatformClient, name: str, required: bool = True) -> dict | None:
+    """Find an app by name.
+
+    Returns the app dict, or exits with an error if it doesn't exist. With
+    required=False a missing app returns None instead.
+    """
+    # The platform filters by name; older ones ignore the param, so match here too
+    apps = client.list_apps(name=name)
+    app = next((a for a in apps if a["name"] == name), None)
+    if app is None and required:
+        _exit_unknown_apps([name])
+    return app
+
+
+def resolve_apps(client: PlatformClient, names: list[str]) -> dict[str, dict]:
+    """Find several apps by name with one listing. Exits if any is missing."""
+    by_name: dict[str, dict] = {}
+    for app in client.list_apps():
+        # First match wins, like resolve_app
+        by_name.setdefault(app["name"], app)
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        _exit_unknown_apps(missing)
+    return {name: by_name[name] for name in names}
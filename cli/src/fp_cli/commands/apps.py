@@ -1,27 +1,18 @@
 """fp list, fp status, fp open, fp delete — app management commands."""
 
-import webbrowser
-from urllib.parse import urlparse
-
 import typer
-from rich.table import Table
 
-from ..api.client import PlatformClient, PlatformError, resolve_app
+from ..api.client import PlatformError, client_for, get_app_url, resolve_app
 from ..config import get_active_platform_or_exit
 from ..console import console, err_console
-from ..project import read_project, find_project_file
-
-
-def _get_app_domain(platform_url: str) -> str:
-    """Derive app domain from platform URL."""
-    host = urlparse(platform_url).hostname or ""
-    if host.startswith("platform."):
-        return host[len("platform."):]
-    return host
+from ..project import find_project_file, load_project_file
 
-
-def _get_app_url(app_id: str, platform_url: str) -> str:
-    return f"https://app-{app_id}.{_get_app_domain(platform_url)}"
+STATUS_STYLES = {
+    "running": "green",
+    "deploying": "yellow",
+    "error": "red",
+    "failed": "red",
+}
 
 
 def _resolve_app_name(name: str | None) -> str:
@@ -30,9 +21,7 @@ def _resolve_app_name(name: str | None) -> str:
         return name
     fp_file = find_project_file()
     if fp_file:
-        import yaml
-
-        data = yaml.safe_load(fp_file.read_text()) or {}
+        data = load_project_file(fp_file)
         if data.get("name"):
             return data["name"]
     err_console.print("[red]No app name provided and no .fp.yaml found.[/red]")
@@ -42,7 +31,7 @@ def _resolve_app_name(name: str | None) -> str:
 def list_apps():
     """List all your apps."""
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     try:
         apps = client.list_apps()
@@ -54,6 +43,8 @@ def list_apps():
         console.print("[dim]No apps yet.[/dim] Run [bold]fp init[/bold] + [bold]fp deploy[/bold] to create one.")
         return
 
+    from rich.table import Table
+
     table = Table(show_header=True, header_style="bold")
     table.add_column("Name")
     table.add_column("Status")
@@ -62,17 +53,13 @@ def list_apps():
 
     for app in apps:
         status = app.get("status", "unknown")
-        style = {
-            "running": "green",
-            "deploying": "yellow",
-            "error": "red",
-            "failed": "red",
-        }.get(status, "dim")
-
-        url = _get_app_url(app["app_id"], platform["url"])
+        style = STATUS_STYLES.get(status, "dim")
+
+        url = get_app_url(app["app_id"], platform["url"])
         last_deploy = app.get("last_deploy_at") or app.get("created_at") or ""
-        if last_deploy and "T" in last_deploy:
-            last_deploy = last_deploy.split("T")[0]
+        # ISO-8601 timestamp: keep just the date
+        if len(last_deploy) > 10 and last_deploy[10] == "T":
+            last_deploy = last_deploy[:10]
 
         table.add_row(
             app["name"],
@@ -88,15 +75,21 @@ def status(name: str = typer.Argument(None, help="App name (uses .fp.yaml if omi
     """Show app status."""
     app_name = _resolve_app_name(name)
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, app_name)
-    app_url = _get_app_url(app["app_id"], platform["url"])
+    app_url = get_app_url(app["app_id"], platform["url"])
 
+    events: list[dict] = []
     try:
-        ds = client.deploy_status(app["app_id"])
-    except PlatformError:
-        ds = {}
+        bundle = client.status_bundle(app["app_id"])
+        app, ds, events = bundle["app"], bundle["deploy_status"], bundle["events"]
+    except PlatformError as e:
+        # Older platforms have no bundle endpoint; fall back to deploy-status
+        try:
+            ds = client.deploy_status(app["app_id"]) if e.status_code == 404 else {}
+        except PlatformError:
+            ds = {}
 
     app_status = ds.get("status") or app.get("status", "unknown")
     ready = ds.get("deployment_ready", False)
@@ -110,16 +103,23 @@ def status(name: str = typer.Argument(None, help="App name (uses .fp.yaml if omi
     console.print(f"  ID:     {app['app_id']}")
     if ds.get("last_error"):
         console.print(f"  Error:  [red]{ds['last_error']}[/red]")
+    if events:
+        console.print("  Events:")
+        for event in events:
+            style = "yellow" if event.get("type") == "Warning" else "dim"
+            console.print(f"    [{style}]{event.get('reason', '')}[/{style}] {event.get('message', '')}")
 
 
 def open_app(name: str = typer.Argument(None, help="App name (uses .fp.yaml if omitted)")):
     """Open app URL in browser."""
     app_name = _resolve_app_name(name)
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, app_name)
-    url = _get_app_url(app["app_id"], platform["url"])
+    url = get_app_url(app["app_id"], platform["url"])
+
+    import webbrowser
 
     console.print(f"Opening [link={url}]{url}[/link]")
     webbrowser.open(url)
@@ -131,7 +131,7 @@ def delete(
 ):
     """Delete an app."""
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, name)
 
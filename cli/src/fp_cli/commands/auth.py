@@ -1,10 +1,15 @@
 """Authentication commands: fp auth, fp whoami, fp logout"""
 
 import typer
-from rich.prompt import Prompt
 
-from ..api.client import PlatformClient, PlatformError
-from ..config import save_platform, remove_platform, get_active_platform
+from ..api.client import PlatformError, client_for
+from ..config import (
+    cached_user_info,
+    get_active_platform,
+    remove_platform,
+    save_platform,
+    save_user_info,
+)
 from ..console import console, err_console
 
 app = typer.Typer(help="Authentication commands")
@@ -23,25 +28,27 @@ def login(
 
     if token:
         # Token-based auth (CI/headless)
-        client = PlatformClient(url, token)
+        client = client_for(url, token)
         try:
             user = client.me()
         except PlatformError as e:
             err_console.print(f"[red]Authentication failed:[/red] {e.message}")
             raise typer.Exit(1)
 
-        save_platform(name, url, token, user["username"])
+        save_platform(name, url, token, user["username"], user)
         console.print(
             f"Authenticated as [bold]{user['username']}[/bold] on {url}"
         )
         return
 
     # Interactive login
+    from rich.prompt import Prompt
+
     console.print(f"Logging in to [bold]{url}[/bold]")
     username = Prompt.ask("Username")
     password = Prompt.ask("Password", password=True)
 
-    client = PlatformClient(url)
+    client = client_for(url)
     try:
         result = client.login(username, password)
     except PlatformError as e:
@@ -51,21 +58,23 @@ def login(
     access_token = result["access_token"]
 
     # Verify the token works
-    client = PlatformClient(url, access_token)
+    client = client_for(url, access_token)
     try:
         user = client.me()
     except PlatformError as e:
         err_console.print(f"[red]Token verification failed:[/red] {e.message}")
         raise typer.Exit(1)
 
-    save_platform(name, url, access_token, user["username"])
+    save_platform(name, url, access_token, user["username"], user)
     console.print(
         f"Authenticated as [bold]{user['username']}[/bold] on {url}"
     )
 
 
 @app.command()
-def whoami():
+def whoami(
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore the cached identity and ask the platform"),
+):
     """Show current authentication status."""
     platform = get_active_platform()
     if not platform:
@@ -74,16 +83,19 @@ def whoami():
         )
         raise typer.Exit(1)
 
-    client = PlatformClient(platform["url"], platform["token"])
-    try:
-        user = client.me()
-    except PlatformError as e:
-        err_console.print(f"[red]Token expired or invalid:[/red] {e.message}")
-        err_console.print("Run [bold]fp auth login <platform-url>[/bold] to re-authenticate.")
-        raise typer.Exit(1)
+    user = None if refresh else cached_user_info(platform)
+    if user is None:
+        client = client_for(platform["url"], platform["token"])
+        try:
+            user = client.me()
+        except PlatformError as e:
+            err_console.print(f"[red]Token expired or invalid:[/red] {e.message}")
+            err_console.print("Run [bold]fp auth login <platform-url>[/bold] to re-authenticate.")
+            raise typer.Exit(1)
+        save_user_info(platform["name"], user)
 
     console.print(f"  User:     [bold]{user['username']}[/bold]")
-    console.print(f"  Email:    {user.get('email', 'n/a')}")
+    console.print(f"  Email:    {user.get('email') or 'n/a'}")
     console.print(f"  Platform: {platform['url']}")
     console.print(f"  Config:   {platform['name']}")
     if user.get("is_admin"):
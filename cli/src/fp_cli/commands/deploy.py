@@ -3,13 +3,11 @@
 import time
 
 import typer
-from rich.live import Live
-from rich.spinner import Spinner
 
-from ..api.client import PlatformClient, PlatformError, resolve_app
+from ..api.client import PlatformClient, PlatformError, client_for, get_app_url, resolve_app
 from ..config import get_active_platform_or_exit
 from ..console import console, err_console
-from ..project import read_project, collect_files, detect_mode
+from ..project import read_project, collect_files, detect_mode, resolve_env
 
 PHASE_LABELS = {
     "validating": "Validating code...",
@@ -25,7 +23,9 @@ PHASE_LABELS = {
 }
 
 
-def deploy():
+def deploy(
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Explain status stream fallbacks"),
+):
     """Deploy the current project to the platform."""
     project = read_project()
     app_name = project.get("name")
@@ -36,7 +36,7 @@ def deploy():
         raise typer.Exit(1)
 
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     # Collect files from directory
     files = collect_files(entrypoint=entrypoint)
@@ -49,8 +49,7 @@ def deploy():
         console.print(f"  mode: single-file")
 
     # Check if app already exists (update vs create)
-    existing_apps = client.list_apps()
-    existing = next((a for a in existing_apps if a["name"] == app_name), None)
+    existing = resolve_app(client, app_name, required=False)
 
     # Build payload
     payload: dict = {"name": app_name}
@@ -65,16 +64,7 @@ def deploy():
     # Include env vars from .fp.yaml if present
     env = project.get("env")
     if env and isinstance(env, dict):
-        import os
-
-        resolved = {}
-        for key, value in env.items():
-            if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-                env_name = value[2:-1]
-                resolved[key] = os.environ.get(env_name, "")
-            else:
-                resolved[key] = str(value)
-        payload["env_vars"] = resolved
+        payload["env_vars"] = resolve_env(env)
 
     try:
         if existing:
@@ -93,65 +83,109 @@ def deploy():
         raise typer.Exit(1)
 
     # Poll deployment status
-    _poll_deploy_status(client, app_id, platform["url"])
-
-
-def _poll_deploy_status(client: PlatformClient, app_id: str, platform_url: str):
-    """Poll deploy-status until ready, error, or timeout."""
-    max_polls = 60
-    poll_interval = 2
-
-    with Live(
-        Spinner("dots", text="Creating resources..."),
-        console=console,
-        transient=True,
-    ) as live:
-        for i in range(max_polls):
-            try:
-                status = client.deploy_status(app_id)
-            except PlatformError:
-                time.sleep(poll_interval)
-                continue
-
-            phase = "creating_resources"
-            if status.get("deployment_ready"):
-                phase = "ready"
-            elif status.get("status") == "error":
-                phase = "error"
-            elif status.get("deploy_stage"):
-                phase = status["deploy_stage"]
-
-            label = PHASE_LABELS.get(phase, phase)
-            live.update(Spinner("dots", text=label))
-
-            if phase == "ready":
-                break
-            if phase == "error":
-                err_console.print(
-                    f"\n[red]Deployment failed:[/red] {status.get('last_error', 'Unknown error')}"
-                )
-                raise typer.Exit(1)
-
-            time.sleep(poll_interval)
-        else:
-            err_console.print(
-                "\n[yellow]Deployment is still in progress.[/yellow] "
-                "Check status with [bold]fp status[/bold]"
-            )
-            raise typer.Exit(1)
-
-    # Derive app URL from platform URL
-    # platform.gatorlunch.com -> app-{id}.gatorlunch.com
-    from urllib.parse import urlparse
-
-    parsed = urlparse(platform_url)
-    host = parsed.hostname or ""
-    # Strip "platform." prefix to get the app domain
-    if host.startswith("platform."):
-        app_domain = host[len("platform."):]
-    else:
-        app_domain = host
-    app_url = f"https://app-{app_id}.{app_domain}"
+    _poll_deploy_status(client, app_id, platform["url"], verbose=verbose)
+
+
+def _deploy_phase(status: dict) -> str:
+    """Map a deploy-status payload to a PHASE_LABELS key."""
+    if status.get("deployment_ready"):
+        return "ready"
+    if status.get("status") == "error":
+        return "error"
+    return status.get("deploy_stage") or "creating_resources"
+
+
+def _poll_deploy_status(
+    client: PlatformClient, app_id: str, platform_url: str, verbose: bool = False
+):
+    """Follow deploy status until ready, error, or timeout.
+
+    Status changes are pushed over WebSocket; if the stream can't be opened
+    or drops before a terminal state, fall back to polling deploy-status.
+    Unexpected errors from the stream propagate; with verbose, the reason
+    for a fallback is printed.
+    """
+    import httpx
+    from websockets.exceptions import ConnectionClosedError, InvalidHandshake
+    from rich.live import Live
+    from rich.spinner import Spinner
+
+    # HTTP fallback: poll quickly while phases are moving, back off while
+    # one drags on (image pulls), and give up after a wall-clock budget
+    poll_budget = 120.0
+    min_interval, max_interval = 0.5, 5.0
+    probe_timeout = 2.0
+
+    # One spinner for the whole deploy: only its label changes, and only
+    # when the phase does, so the animation isn't restarted every poll
+    spinner = Spinner("dots", text="Creating resources...")
+    shown_phase = None
+
+    with Live(spinner, console=console, transient=True):
+
+        def show(status: dict) -> str:
+            nonlocal shown_phase
+            phase = _deploy_phase(status)
+            if phase != shown_phase:
+                spinner.update(text=PHASE_LABELS.get(phase, phase))
+                shown_phase = phase
+            return phase
+
+        final = None
+        try:
+            for status in client.deploy_status_stream(app_id):
+                if show(status) in ("ready", "error"):
+                    final = status
+                    break
+        except (OSError, InvalidHandshake, ConnectionClosedError) as e:
+            # Includes 401/403 handshake rejections: Starlette answers 403 for
+            # a missing route or a socket closed before accept, and the
+            # polling below uses the REST token, so it reports real auth errors
+            if verbose:
+                err_console.print(f"[dim]Status stream unavailable ({e}), polling instead[/dim]")
+
+        if final is None:
+            deadline = time.monotonic() + poll_budget
+            interval = min_interval
+            last_phase = None
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                next_tick = now + interval
+                try:
+                    status = client.deploy_status(
+                        app_id, timeout=min(max(interval, probe_timeout), deadline - now)
+                    )
+                except (PlatformError, httpx.TimeoutException):
+                    status = None
+
+                phase = show(status) if status is not None else last_phase
+                if phase in ("ready", "error"):
+                    final = status
+                    break
+
+                if phase == last_phase:
+                    interval = min(interval * 2, max_interval)
+                else:
+                    interval = min_interval
+                    last_phase = phase
+
+                time.sleep(max(0.0, min(next_tick, deadline) - time.monotonic()))
+
+    if final is None:
+        err_console.print(
+            "\n[yellow]Deployment is still in progress.[/yellow] "
+            "Check status with [bold]fp status[/bold]"
+        )
+        raise typer.Exit(1)
+    if _deploy_phase(final) == "error":
+        err_console.print(
+            f"\n[red]Deployment failed:[/red] {final.get('last_error', 'Unknown error')}"
+        )
+        raise typer.Exit(1)
+
+    app_url = get_app_url(app_id, platform_url)
 
     console.print()
     console.print("[green]Deployed successfully![/green]")
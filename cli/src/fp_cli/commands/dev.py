@@ -1,13 +1,13 @@
 """fp dev — run locally with hot reload."""
 
 import os
-import subprocess
 import sys
+from importlib.util import find_spec
 
 import typer
 
 from ..console import console, err_console
-from ..project import read_project
+from ..project import read_project, resolve_env
 
 
 def dev(
@@ -21,48 +21,52 @@ def dev(
     module = entrypoint.replace("/", ".").removesuffix(".py")
     app_ref = f"{module}:app"
 
-    # Set up environment
-    env = os.environ.copy()
+    # Variables to set on top of the inherited environment
+    overlay: dict[str, str] = {}
 
     # Inject PLATFORM_MONGO_URI if database is enabled
     if project.get("database"):
-        mongo_uri = env.get("PLATFORM_MONGO_URI", "mongodb://localhost:27017")
-        env["PLATFORM_MONGO_URI"] = mongo_uri
+        mongo_uri = os.environ.get("PLATFORM_MONGO_URI", "mongodb://localhost:27017")
+        overlay["PLATFORM_MONGO_URI"] = mongo_uri
         console.print(f"  PLATFORM_MONGO_URI={mongo_uri}")
 
     # Resolve env vars from .fp.yaml
     project_env = project.get("env")
     if project_env and isinstance(project_env, dict):
-        for key, value in project_env.items():
-            if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-                env_name = value[2:-1]
-                env[key] = os.environ.get(env_name, "")
-            else:
-                env[key] = str(value)
+        overlay.update(resolve_env(project_env))
+
+    if find_spec("uvicorn") is None:
+        err_console.print(
+            "[red]uvicorn not found.[/red] Install it: [bold]pip install uvicorn[/bold]"
+        )
+        raise typer.Exit(1)
 
     console.print(f"Running [bold]{app_ref}[/bold] on port {port}")
     console.print("[dim]Ctrl+C to stop[/dim]")
     console.print()
 
+    args = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        app_ref,
+        "--reload",
+        "--host",
+        "0.0.0.0",
+        "--port",
+        str(port),
+    ]
+    # Replace this process with uvicorn rather than waiting on a child:
+    # Ctrl+C goes straight to uvicorn and no idle interpreter is left behind.
+    # Nothing after exec runs, so flush what we've printed first.
+    sys.stdout.flush()
+    sys.stderr.flush()
     try:
-        subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "uvicorn",
-                app_ref,
-                "--reload",
-                "--host",
-                "0.0.0.0",
-                "--port",
-                str(port),
-            ],
-            env=env,
-        )
-    except KeyboardInterrupt:
-        pass
-    except FileNotFoundError:
-        err_console.print(
-            "[red]uvicorn not found.[/red] Install it: [bold]pip install uvicorn[/bold]"
-        )
+        if overlay:
+            os.execve(sys.executable, args, {**os.environ, **overlay})
+        else:
+            # Nothing to add: the environment is inherited as-is, no copy
+            os.execv(sys.executable, args)
+    except OSError as e:
+        err_console.print(f"[red]Failed to start uvicorn:[/red] {e}")
         raise typer.Exit(1)
@@ -3,9 +3,8 @@
 from pathlib import Path
 
 import typer
-from rich.prompt import Prompt
 
-from ..api.client import PlatformClient, PlatformError
+from ..api.client import PlatformError, client_for
 from ..config import get_active_platform
 from ..console import console, err_console
 from ..project import write_project, PROJECT_FILE
@@ -52,6 +51,8 @@ def init(
         return
 
     # Interactive: pick framework
+    from rich.prompt import Prompt
+
     framework = Prompt.ask(
         "Framework",
         choices=["fastapi", "fasthtml"],
@@ -83,7 +84,7 @@ def _init_from_template(template_name: str, app_name: str):
         )
         raise typer.Exit(1)
 
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     try:
         templates = client.list_templates()
@@ -92,11 +93,8 @@ def _init_from_template(template_name: str, app_name: str):
         raise typer.Exit(1)
 
     # Find template by name (case-insensitive)
-    match = None
-    for t in templates:
-        if t["name"].lower() == template_name.lower():
-            match = t
-            break
+    wanted = template_name.casefold()
+    match = next((t for t in templates if t["name"].casefold() == wanted), None)
 
     if not match:
         err_console.print(f"[red]Template '{template_name}' not found.[/red]")
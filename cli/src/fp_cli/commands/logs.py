@@ -1,14 +1,18 @@
 """fp logs — tail app logs."""
 
-import json
 import re
+import sys
+import time
 
 import typer
 
-from ..api.client import PlatformClient, PlatformError, resolve_app
+from ..api.client import PlatformClient, PlatformError, client_for, json_loads, resolve_app
 from ..config import get_active_platform_or_exit
 from ..console import console, err_console
-from ..project import find_project_file
+from ..project import find_project_file, load_project_file
+
+_SINCE_RE = re.compile(r"^(\d+)([smh])$")
+_SINCE_MULT = {"s": 1, "m": 60, "h": 3600}
 
 
 def _resolve_app_name(name: str | None) -> str:
@@ -16,24 +20,51 @@ def _resolve_app_name(name: str | None) -> str:
         return name
     fp_file = find_project_file()
     if fp_file:
-        import yaml
-
-        data = yaml.safe_load(fp_file.read_text()) or {}
+        data = load_project_file(fp_file)
         if data.get("name"):
             return data["name"]
     err_console.print("[red]No app name provided and no .fp.yaml found.[/red]")
     raise typer.Exit(1)
 
 
+class _LineBuffer:
+    """Batch plain log lines into a few stdout writes.
+
+    Rich's console.print locks, parses markup and flushes on every call,
+    which dominates when tailing busy apps. Lines are flushed every
+    `max_lines` or `max_delay` seconds, and before anything else is printed.
+    """
+
+    def __init__(self, max_lines: int = 64, max_delay: float = 0.05):
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines: list[str] = []
+        self._last_flush = time.monotonic()
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def write(self, line: str):
+        self._lines.append(line + "\n")
+        if len(self._lines) >= self.max_lines or time.monotonic() - self._last_flush > self.max_delay:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            sys.stdout.write("".join(self._lines))
+            sys.stdout.flush()
+            self._lines.clear()
+        self._last_flush = time.monotonic()
+
+
 def _parse_since(since: str) -> int:
     """Parse duration string like '1h', '30m', '5s' to seconds."""
-    match = re.match(r"^(\d+)([smh])$", since.strip())
+    match = _SINCE_RE.match(since.strip())
     if not match:
         err_console.print(f"[red]Invalid --since format: '{since}'.[/red] Use e.g. 30s, 5m, 1h")
         raise typer.Exit(1)
-    value, unit = int(match.group(1)), match.group(2)
-    multiplier = {"s": 1, "m": 60, "h": 3600}
-    return value * multiplier[unit]
+    value, unit = match.groups()
+    return int(value) * _SINCE_MULT[unit]
 
 
 def logs(
@@ -45,7 +76,7 @@ def logs(
     """Tail app logs."""
     app_name = _resolve_app_name(name)
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, app_name)
     app_id = app["app_id"]
@@ -60,29 +91,32 @@ def _fetch_logs_http(client: PlatformClient, app_id: str, tail: int, since: str)
     """Fetch logs via HTTP and print."""
     since_seconds = _parse_since(since) if since else None
 
+    printed = False
+    out = _LineBuffer()
     try:
-        data = client.get_logs(app_id, tail_lines=tail, since_seconds=since_seconds)
+        for line in client.stream_logs(app_id, tail_lines=tail, since_seconds=since_seconds):
+            ts = line.get("timestamp", "")
+            msg = line.get("message", "")
+            if ts:
+                out.flush()
+                console.print(f"[dim]{ts}[/dim] {msg}")
+            else:
+                out.write(msg)
+            printed = True
     except PlatformError as e:
+        out.flush()
         err_console.print(f"[red]Failed to fetch logs:[/red] {e.message}")
         raise typer.Exit(1)
+    out.flush()
 
-    log_lines = data.get("logs", [])
-    if not log_lines:
+    if not printed:
         console.print("[dim]No logs available.[/dim]")
-        return
-
-    for line in log_lines:
-        ts = line.get("timestamp", "")
-        msg = line.get("message", "")
-        if ts:
-            console.print(f"[dim]{ts}[/dim] {msg}")
-        else:
-            console.print(msg)
 
 
 def _stream_logs_ws(platform: dict, app_id: str):
     """Stream logs via WebSocket."""
     import websockets.sync.client as ws_client
+    from websockets.exceptions import ConnectionClosedOK
 
     # Build WebSocket URL from platform URL
     ws_url = platform["url"].replace("https://", "wss://").replace("http://", "ws://")
@@ -90,36 +124,51 @@ def _stream_logs_ws(platform: dict, app_id: str):
 
     console.print(f"[dim]Streaming logs (Ctrl+C to stop)...[/dim]")
 
+    out = _LineBuffer()
     try:
         with ws_client.connect(url) as ws:
-            for message in ws:
+            while True:
                 try:
-                    data = json.loads(message)
-                except (json.JSONDecodeError, TypeError):
-                    console.print(str(message))
+                    # Wake up to flush pending lines when the stream goes quiet
+                    message = ws.recv(timeout=out.max_delay if out else None)
+                except TimeoutError:
+                    out.flush()
+                    continue
+                except ConnectionClosedOK:
+                    break
+
+                try:
+                    data = json_loads(message)
+                except (ValueError, TypeError):
+                    out.write(str(message))
                     continue
 
                 msg_type = data.get("type", "")
                 if msg_type == "log":
                     ts = data.get("timestamp", "")
                     msg = data.get("message", "")
-                    if ts:
-                        console.print(f"[dim]{ts}[/dim] {msg}")
-                    else:
-                        console.print(msg)
+                    if not ts:
+                        out.write(msg)
+                        continue
+                    out.flush()
+                    console.print(f"[dim]{ts}[/dim] {msg}")
                 elif msg_type == "connected":
+                    out.flush()
                     console.print(f"[dim]Connected to pod: {data.get('pod_name', 'unknown')}[/dim]")
                 elif msg_type == "status":
+                    out.flush()
                     console.print(f"[yellow]{data.get('message', '')}[/yellow]")
                 elif msg_type == "error":
+                    out.flush()
                     err_console.print(f"[red]{data.get('message', '')}[/red]")
+        out.flush()
     except KeyboardInterrupt:
+        out.flush()
         console.print("\n[dim]Stopped.[/dim]")
     except Exception as e:
+        out.flush()
         err_console.print(f"[red]WebSocket error:[/red] {e}")
         console.print("[dim]Falling back to HTTP logs...[/dim]")
         # Fallback to HTTP
-        from ..api.client import PlatformClient
-
-        client = PlatformClient(platform["url"], platform["token"])
+        client = client_for(platform["url"], platform["token"])
         _fetch_logs_http(client, app_id, 50, "")
@@ -1,22 +1,35 @@
 """fp pull — pull app code to local directory."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import typer
 
-from ..api.client import PlatformClient, PlatformError, resolve_app
+from ..api.client import PlatformError, client_for, resolve_app
 from ..config import get_active_platform_or_exit
 from ..console import console, err_console
 from ..project import write_project, PROJECT_FILE
 
 
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path unless it already holds exactly that. Returns True if written."""
+    data = content.encode()
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
 def pull(
     name: str = typer.Argument(..., help="App name to pull"),
     force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing files"),
 ):
     """Pull app code from the platform to the current directory."""
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, name)
 
@@ -36,22 +49,19 @@ def pull(
         raise typer.Exit(1)
 
     mode = detail.get("mode", "single")
-    written = 0
 
     if mode == "multi" and detail.get("files"):
         files = detail["files"]
         # Prefer deployed files, fall back to draft
         if detail.get("deployed_files"):
             files = detail["deployed_files"]
-        for filename, content in files.items():
-            filepath = cwd / filename
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_text(content)
-            written += 1
+        for parent in {(cwd / filename).parent for filename in files}:
+            parent.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            changed = list(pool.map(_write_if_changed, [cwd / f for f in files], files.values()))
     elif detail.get("code") or detail.get("deployed_code"):
         code = detail.get("deployed_code") or detail.get("code", "")
-        (cwd / "app.py").write_text(code)
-        written = 1
+        changed = [_write_if_changed(cwd / "app.py", code)]
     else:
         err_console.print("[red]App has no code to pull.[/red]")
         raise typer.Exit(1)
@@ -61,5 +71,10 @@ def pull(
     project_data = {"name": detail["name"], "entrypoint": entrypoint}
     write_project(project_data)
 
-    console.print(f"Pulled [bold]{detail['name']}[/bold] ({written} file{'s' if written != 1 else ''})")
+    pulled = len(changed)
+    unchanged = pulled - sum(changed)
+    summary = f"{pulled} file{'s' if pulled != 1 else ''}"
+    if unchanged:
+        summary += f", {unchanged} unchanged"
+    console.print(f"Pulled [bold]{detail['name']}[/bold] ({summary})")
     console.print(f"  Written to: {cwd}")
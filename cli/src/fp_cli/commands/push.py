@@ -2,7 +2,7 @@
 
 import typer
 
-from ..api.client import PlatformClient, PlatformError, resolve_app
+from ..api.client import PlatformError, client_for, resolve_app
 from ..config import get_active_platform_or_exit
 from ..console import console, err_console
 from ..project import read_project, collect_files, detect_mode
@@ -19,7 +19,7 @@ def push():
         raise typer.Exit(1)
 
     platform = get_active_platform_or_exit()
-    client = PlatformClient(platform["url"], platform["token"])
+    client = client_for(platform["url"], platform["token"])
 
     app = resolve_app(client, app_name)
 
@@ -5,6 +5,10 @@ import typer
 from ..console import console, err_console
 from ..project import read_project, collect_files, detect_mode
 
+# Below this much Python source, worker startup costs more than the parsing
+PARALLEL_MIN_FILES = 5
+PARALLEL_MIN_BYTES = 128 * 1024
+
 
 def validate():
     """Validate code against platform rules (syntax, imports, security)."""
@@ -18,7 +22,16 @@ def validate():
     mode = detect_mode(files)
 
     if mode == "multi":
-        is_valid, error_msg, error_line, error_file = validate_multifile(files, entrypoint)
+        sources = [content for name, content in files.items() if name.endswith(".py")]
+        if len(sources) >= PARALLEL_MIN_FILES and sum(map(len, sources)) >= PARALLEL_MIN_BYTES:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor() as executor:
+                is_valid, error_msg, error_line, error_file = validate_multifile(
+                    files, entrypoint, executor=executor
+                )
+        else:
+            is_valid, error_msg, error_line, error_file = validate_multifile(files, entrypoint)
         if is_valid:
             console.print(f"[green]Validation passed[/green] ({len(files)} files)")
         else:
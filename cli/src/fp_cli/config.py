@@ -1,6 +1,8 @@
 """Platform configuration stored in ~/.fp/config.toml"""
 
+import copy
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 if sys.version_info >= (3, 11):
@@ -14,50 +16,111 @@ else:
 CONFIG_DIR = Path.home() / ".fp"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 
+# How long a cached /me response may answer `fp auth whoami`
+USER_CACHE_TTL = 300
+
+
+# Last parsed config and the st_mtime_ns it was read at
+_config_cache: tuple[int, dict] | None = None
+
 
 def _read_config() -> dict:
-    if not CONFIG_FILE.exists():
+    global _config_cache
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    return tomllib.loads(CONFIG_FILE.read_text())
+    if _config_cache is None or _config_cache[0] != mtime:
+        _config_cache = (mtime, tomllib.loads(CONFIG_FILE.read_text()))
+    # Callers mutate the result before writing it back
+    return copy.deepcopy(_config_cache[1])
 
 
 def _write_config(config: dict) -> None:
+    global _config_cache
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     lines = _serialize_toml(config)
     CONFIG_FILE.write_text(lines)
     CONFIG_FILE.chmod(0o600)
+    _config_cache = (CONFIG_FILE.stat().st_mtime_ns, copy.deepcopy(config))
+
+
+def _toml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return f'"{value}"'
+
+
+def _toml_table(name: str, table: dict) -> list[str]:
+    # Plain keys must precede sub-tables, or TOML assigns them to the last header
+    lines = [f"[{name}]"]
+    lines.extend(f"{k} = {_toml_value(v)}" for k, v in table.items() if not isinstance(v, dict))
+    for k, v in table.items():
+        if isinstance(v, dict):
+            lines.append("")
+            lines.extend(_toml_table(f"{name}.{k}", v))
+    return lines
 
 
 def _serialize_toml(data: dict, prefix: str = "") -> str:
-    """Minimal TOML serializer for flat/nested string tables."""
+    """Minimal TOML serializer for nested tables of strings and booleans."""
     lines = []
     for key, value in data.items():
         full_key = f"{prefix}.{key}" if prefix else key
         if isinstance(value, dict):
-            lines.append(f"[{full_key}]")
-            for k, v in value.items():
-                if isinstance(v, dict):
-                    lines.append("")
-                    lines.append(f"[{full_key}.{k}]")
-                    for k2, v2 in v.items():
-                        lines.append(f'{k2} = "{v2}"')
-                else:
-                    lines.append(f'{k} = "{v}"')
+            lines.extend(_toml_table(full_key, value))
             lines.append("")
         else:
-            lines.append(f'{key} = "{value}"')
+            lines.append(f"{key} = {_toml_value(value)}")
     return "\n".join(lines) + "\n"
 
 
-def save_platform(name: str, url: str, token: str, username: str) -> None:
+def _user_cache(user: dict) -> dict:
+    return {
+        "email": user.get("email") or "",
+        "is_admin": bool(user.get("is_admin")),
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def save_platform(
+    name: str, url: str, token: str, username: str, user_info: dict | None = None
+) -> None:
     config = _read_config()
     platforms = config.get("platforms", {})
     platforms[name] = {"url": url, "token": token, "username": username}
+    if user_info:
+        platforms[name]["user"] = _user_cache(user_info)
     config["platforms"] = platforms
     config["active"] = {"platform": name}
     _write_config(config)
 
 
+def save_user_info(name: str, user_info: dict) -> None:
+    """Refresh the cached /me response for a stored platform."""
+    config = _read_config()
+    platform = config.get("platforms", {}).get(name)
+    if not platform:
+        return
+    platform["username"] = user_info.get("username", platform.get("username", ""))
+    platform["user"] = _user_cache(user_info)
+    _write_config(config)
+
+
+def cached_user_info(platform: dict, max_age: float = USER_CACHE_TTL) -> dict | None:
+    """Return the platform's cached /me response if younger than max_age seconds."""
+    user = platform.get("user")
+    if not user or not user.get("fetched_at"):
+        return None
+    try:
+        fetched_at = datetime.fromisoformat(user["fetched_at"])
+    except ValueError:
+        return None
+    if (datetime.now(timezone.utc) - fetched_at).total_seconds() > max_age:
+        return None
+    return {**user, "username": platform.get("username", "")}
+
+
 def remove_platform(name: str) -> bool:
     config = _read_config()
     platforms = config.get("platforms", {})
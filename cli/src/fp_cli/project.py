@@ -1,12 +1,43 @@
 """Project manifest (.fp.yaml) read/write."""
 
+import os
+import re
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-import yaml
-
 PROJECT_FILE = ".fp.yaml"
 
 ALLOWED_EXTENSIONS = {".py", ".css", ".js", ".svg", ".html", ".json", ".txt"}
+_ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)
+
+# Files larger than this are never read; the platform caps files at 100KB
+MAX_FILE_BYTES = 1024 * 1024
+
+# Projects with more files than this are read on a thread pool
+PARALLEL_READ_MIN_FILES = 16
+
+# Directory and file names never collected (hidden names are skipped too)
+_SKIP_NAMES = frozenset({"__pycache__", "node_modules"})
+
+# env values of the form ${NAME} are read from the local environment
+_ENV_REF_RE = re.compile(r"^\$\{([A-Za-z_][A-Za-z0-9_]*)\}$")
+
+# Parsed manifests keyed by (path, mtime_ns); an edit invalidates the entry
+_project_cache: dict[tuple[str, int], dict] = {}
+
+
+@lru_cache(maxsize=1)
+def _yaml():
+    """Import yaml on first use and pick the libyaml-backed safe loader/dumper if built."""
+    import yaml
+
+    try:
+        from yaml import CSafeDumper as Dumper, CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeDumper as Dumper, SafeLoader as Loader
+    return yaml, Loader, Dumper
 
 
 def find_project_file(start: Path | None = None) -> Path | None:
@@ -19,6 +50,19 @@ def find_project_file(start: Path | None = None) -> Path | None:
     return None
 
 
+def load_project_file(fp_file: Path) -> dict:
+    """Parse a .fp.yaml, reusing the previous parse while the file is unchanged."""
+    key = (str(fp_file), fp_file.stat().st_mtime_ns)
+    data = _project_cache.get(key)
+    if data is None:
+        yaml, loader, _ = _yaml()
+        # Fed the file stream directly rather than a decoded copy
+        with fp_file.open("rb") as stream:
+            data = yaml.load(stream, Loader=loader) or {}
+        _project_cache[key] = data
+    return dict(data)
+
+
 def read_project(path: Path | None = None) -> dict:
     """Read and return project config. Exits if not found."""
     fp_file = path or find_project_file()
@@ -29,45 +73,104 @@ def read_project(path: Path | None = None) -> dict:
             f"[red]No {PROJECT_FILE} found.[/red] Run [bold]fp init[/bold] first."
         )
         raise SystemExit(1)
-    return yaml.safe_load(fp_file.read_text()) or {}
+    return load_project_file(fp_file)
 
 
 def write_project(data: dict, directory: Path | None = None) -> Path:
     """Write project config to .fp.yaml. Returns the file path."""
+    yaml, _, dumper = _yaml()
     target = (directory or Path.cwd()) / PROJECT_FILE
-    target.write_text(yaml.dump(data, default_flow_style=False, sort_keys=False))
+    target.write_text(yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False))
     return target
 
 
-def collect_files(directory: Path | None = None, entrypoint: str = "app.py") -> dict[str, str]:
-    """Collect all deployable files from directory."""
-    root = directory or Path.cwd()
-    files = {}
+def resolve_env(env: dict, environ: Mapping[str, str] | None = None) -> dict[str, str]:
+    """Resolve the .fp.yaml env mapping to strings, expanding ${NAME} references."""
+    if environ is None:
+        environ = os.environ
+    resolved = {}
+    for key, value in env.items():
+        match = _ENV_REF_RE.match(value) if isinstance(value, str) else None
+        resolved[key] = environ.get(match.group(1), "") if match else str(value)
+    return resolved
 
-    for path in sorted(root.rglob("*")):
-        if not path.is_file():
-            continue
-        if path.suffix not in ALLOWED_EXTENSIONS:
-            continue
 
-        rel = str(path.relative_to(root))
+def _read_source(path: str) -> str:
+    """Read a file as UTF-8 with a single unbuffered read.
 
-        # Skip hidden files, __pycache__, .venv, node_modules, etc.
-        parts = Path(rel).parts
-        if any(p.startswith(".") or p == "__pycache__" or p == ".venv" or p == "node_modules" for p in parts):
-            continue
+    Line endings are normalized to \n, as text mode's universal newlines
+    did, so CRLF checkouts upload the same content and hashes.
+    """
+    with open(path, "rb", buffering=0) as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
-        files[rel] = path.read_text()
 
-    if entrypoint not in files:
+def collect_files(directory: Path | None = None, entrypoint: str = "app.py") -> dict[str, str]:
+    """Collect all deployable files from directory."""
+    root = directory or Path.cwd()
+
+    # A mistyped entrypoint fails before the tree is walked
+    if not (root / entrypoint).is_file():
+        _exit_missing_entrypoint(entrypoint, root)
+
+    selected: list[tuple[str, str]] = []
+    oversized: list[str] = []
+
+    # Walk with scandir, pruning hidden dirs, __pycache__, .venv, node_modules
+    # etc. at the directory entry so their subtrees are never listed
+    stack = [(str(root), "")]
+    while stack:
+        dirpath, rel_prefix = stack.pop()
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or name in _SKIP_NAMES:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel_prefix + name + os.sep))
+                elif name.endswith(_ALLOWED_SUFFIXES) and entry.is_file():
+                    if entry.stat().st_size > MAX_FILE_BYTES:
+                        oversized.append(rel_prefix + name)
+                    else:
+                        selected.append((rel_prefix + name, entry.path))
+
+    # Same order as sorting the paths component-wise
+    selected.sort(key=lambda item: item[0].split(os.sep))
+
+    if oversized:
         from .console import err_console
 
-        err_console.print(f"[red]Entrypoint '{entrypoint}' not found in {root}[/red]")
-        raise SystemExit(1)
+        for rel in sorted(oversized):
+            err_console.print(f"[yellow]Skipping {rel}:[/yellow] larger than {MAX_FILE_BYTES // 1024}KB")
+
+    # File reads release the GIL, so a pool overlaps the syscalls (which
+    # matters most on network mounts); small projects aren't worth the setup
+    paths = [path for _, path in selected]
+    if len(paths) > PARALLEL_READ_MIN_FILES:
+        workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            contents = list(pool.map(_read_source, paths))
+    else:
+        contents = [_read_source(path) for path in paths]
+    files = dict(zip([rel for rel, _ in selected], contents))
+
+    # It exists but was excluded (hidden directory, oversized, ...)
+    if entrypoint not in files:
+        _exit_missing_entrypoint(entrypoint, root)
 
     return files
 
 
+def _exit_missing_entrypoint(entrypoint: str, root: Path) -> None:
+    from .console import err_console
+
+    err_console.print(f"[red]Entrypoint '{entrypoint}' not found in {root}[/red]")
+    raise SystemExit(1)
+
+
 def detect_mode(files: dict[str, str]) -> str:
     """Detect single vs multi mode from collected files."""
     py_files = [f for f in files if f.endswith(".py")]
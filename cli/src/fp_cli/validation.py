@@ -3,14 +3,21 @@ Code validation module for FastAPI Platform
 Validates user-submitted Python code for syntax and security
 """
 import ast
+import functools
+import hashlib
+import io
 import os
-import re
-from typing import Optional, Dict, Tuple, Iterable, Set
+import string
+import threading
+import tokenize
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, Iterable, Iterator, Set, FrozenSet
 
 # Allowed static file extensions (text-based only)
 STATIC_EXTENSIONS = frozenset({'.css', '.js', '.svg', '.html', '.json', '.txt'})
 
-ALLOWED_IMPORTS = {
+ALLOWED_IMPORTS = frozenset({
     'fastapi', 'pydantic', 'typing', 'datetime', 'json', 'math',
     'random', 'string', 'collections', 'itertools', 'functools',
     'operator', 're', 'uuid', 'hashlib', 'base64', 'urllib', 'urllib.parse',
@@ -19,60 +26,338 @@ ALLOWED_IMPORTS = {
     'calendar', 'locale', 'secrets', 'statistics',
     'pymongo', 'bson', 'jinja2',
     'httpx', 'slack_sdk', 'google.auth', 'googleapiclient'
-}
+})
 
-# Forbidden patterns - dangerous operations that should never be allowed
+# Forbidden constructs - dangerous operations that should never be allowed
 # Note: Import restrictions are handled separately via ALLOWED_IMPORTS
-FORBIDDEN_PATTERNS = [
-    r'__import__',
-    r'\beval\s*\(',
-    r'\bexec\s*\(',
-    r'\bcompile\s*\(',
-    r'\bopen\s*\(',
-    r'\bfile\s*\(',
-    r'\bsubprocess\b',
-    r'os\.system',
-    r'os\.popen',
-]
-
-
-def find_forbidden_calls(tree: ast.AST, names: set) -> Optional[tuple[str, int]]:
-    """Return (name, line) for forbidden call names found in AST."""
+# Each rule: (name, message, short message for non-entrypoint files)
+_FORBIDDEN_RULES = (
+    ('dunder_import',
+     "Direct use of __import__() is not allowed for security reasons.",
+     "Direct use of __import__() is not allowed for security reasons."),
+    ('eval',
+     "eval() is not allowed for security reasons. Use proper code structure instead.",
+     "eval() is not allowed for security reasons."),
+    ('exec',
+     "exec() is not allowed for security reasons. Use proper code structure instead.",
+     "exec() is not allowed for security reasons."),
+    ('compile',
+     "compile() is not allowed for security reasons.",
+     "compile() is not allowed for security reasons."),
+    ('open',
+     "File operations are not allowed. Use environment variables or in-memory data instead.",
+     "File operations are not allowed."),
+    ('file',
+     "File operations are not allowed. Use environment variables or in-memory data instead.",
+     "File operations are not allowed."),
+    ('subprocess',
+     "subprocess is not allowed for security reasons.",
+     "subprocess is not allowed for security reasons."),
+    ('os_system',
+     "os.system() is not allowed for security reasons.",
+     "os.system() is not allowed for security reasons."),
+    ('os_popen',
+     "os.popen() is not allowed for security reasons.",
+     "os.popen() is not allowed for security reasons."),
+)
+_FORBIDDEN_MESSAGES = {name: message for name, message, _ in _FORBIDDEN_RULES}
+_FORBIDDEN_SHORT_MESSAGES = {name: short for name, _, short in _FORBIDDEN_RULES}
+
+# Names rejected when called, e.g. eval(...) or re.compile(...)
+_FORBIDDEN_CALLS = frozenset({'eval', 'exec', 'compile', 'open', 'file'})
+# os.<attr> accesses rejected, mapped to their rule
+_FORBIDDEN_OS_ATTRS = {'system': 'os_system', 'popen': 'os_popen'}
+# Tokens that may sit between a name and its call parenthesis
+_SKIPPED_TOKENS = frozenset({tokenize.NL, tokenize.COMMENT})
+# Tokens holding string literal text (3.12+ splits f-strings into parts)
+_STRING_TOKENS = frozenset(
+    t for t in (tokenize.STRING, getattr(tokenize, 'FSTRING_MIDDLE', None)) if t is not None
+)
+
+# Words the token rules look for; a token scan can only find something if
+# one occurs as a whole word (or __import__ occurs anywhere) in the source
+_FORBIDDEN_WORDS = (
+    'eval', 'exec', 'compile', 'open', 'file', 'subprocess', 'system', 'popen',
+)
+_WORD_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+
+
+def _contains_word(code: str, word: str) -> bool:
+    """Return True if word occurs in code with no identifier chars around it."""
+    end_limit = len(code)
+    index = code.find(word)
+    while index != -1:
+        end = index + len(word)
+        if ((index == 0 or code[index - 1] not in _WORD_CHARS)
+                and (end == end_limit or code[end] not in _WORD_CHARS)):
+            return True
+        index = code.find(word, index + 1)
+    return False
+
+
+def _may_contain_forbidden(code: str) -> bool:
+    """Cheap str.find prefilter for the token scan.
+
+    Whole-word matching keeps common names like openapi, UploadFile or
+    filename from triggering a scan. Non-ASCII source always gets scanned,
+    since identifiers are NFKC normalized (a fullwidth \uff45\uff56\uff41\uff4c is eval).
+    """
+    if not code.isascii():
+        return True
+    if '__import__' in code:
+        return True
+    return any(_contains_word(code, word) for word in _FORBIDDEN_WORDS)
+
+
+def _is_fstring(token: str) -> bool:
+    prefix = token[:min(i for i in (token.find('"'), token.find("'")) if i >= 0)]
+    return 'f' in prefix.lower()
+
+
+def _iter_forbidden_in_fstring(token: tokenize.TokenInfo) -> Iterator[tuple[str, int]]:
+    """Apply the forbidden rules to the expressions inside an f-string token.
+
+    Before Python 3.12 an f-string is a single STRING token, so its
+    replacement fields never reach the token scan.
+    """
+    try:
+        tree = ast.parse(token.string, mode='eval')
+    except SyntaxError:
+        return
+    found = []
     for node in ast.walk(tree):
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-            if node.func.id in names:
-                return node.func.id, node.lineno
+        rule = None
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+            if name in _FORBIDDEN_CALLS:
+                rule = name
+        elif isinstance(node, (ast.Name, ast.Attribute)):
+            name = node.id if isinstance(node, ast.Name) else node.attr
+            if '__import__' in name:
+                rule = 'dunder_import'
+            elif name == 'subprocess':
+                rule = 'subprocess'
+            elif (isinstance(node, ast.Attribute) and name in _FORBIDDEN_OS_ATTRS
+                    and isinstance(node.value, ast.Name) and node.value.id == 'os'):
+                rule = _FORBIDDEN_OS_ATTRS[name]
+        if rule:
+            found.append((node.lineno, node.col_offset, rule))
+    for lineno, _, rule in sorted(found):
+        yield rule, token.start[0] + lineno - 1
+
+
+def _iter_forbidden(code: str) -> Iterator[tuple[str, int]]:
+    """Yield (rule, line) for every forbidden construct in code, in source order.
+
+    One pass over the tokens; each token carries its line, so reporting
+    several violations costs no extra scanning. Call rules ignore string
+    literals and comments, but __import__ and subprocess are also flagged
+    inside strings, since getattr(__builtins__, '__import__') reaches them
+    without naming them. Source that cannot be tokenized also fails
+    ast.parse, so it is left for the syntax check to report.
+    """
+    pending_call = None
+    prev = prev2 = None
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type in _SKIPPED_TOKENS:
+                continue
+            if pending_call is not None:
+                if token.type == tokenize.OP and token.string == '(':
+                    yield pending_call
+                pending_call = None
+
+            if token.type == tokenize.NAME:
+                name = token.string
+                if not name.isascii():
+                    name = unicodedata.normalize('NFKC', name)
+                line = token.start[0]
+                if '__import__' in name:
+                    yield 'dunder_import', line
+                elif name == 'subprocess':
+                    yield 'subprocess', line
+                elif name in _FORBIDDEN_CALLS:
+                    pending_call = name, line
+                elif (name in _FORBIDDEN_OS_ATTRS and prev2 is not None
+                        and prev.string == '.' and prev2.string == 'os'):
+                    yield _FORBIDDEN_OS_ATTRS[name], prev2.start[0]
+            elif token.type in _STRING_TOKENS:
+                text = token.string
+                if '__import__' in text:
+                    yield 'dunder_import', token.start[0]
+                elif _contains_word(text, 'subprocess'):
+                    yield 'subprocess', token.start[0]
+                elif token.type == tokenize.STRING and _is_fstring(text):
+                    yield from _iter_forbidden_in_fstring(token)
+            prev2, prev = prev, token
+    except (tokenize.TokenError, SyntaxError):
+        return
+
+
+def _find_forbidden(code: str) -> Optional[tuple[str, int]]:
+    """Return (rule, line) of the first forbidden construct in code, or None."""
+    if not _may_contain_forbidden(code):
+        return None
+    return next(_iter_forbidden(code), None)
+
+
+# Hints appended to import errors, keyed by lowercased top-level module name
+_IMPORT_SUGGESTIONS = {
+    'requests': "Use urllib.parse for URL handling instead",
+    'pandas': "Data processing libraries are not available. Use built-in Python types.",
+    'numpy': "Data processing libraries are not available. Use built-in Python types.",
+    'flask': "This platform uses FastAPI. Import from 'fastapi' instead.",
+    'django': "This platform uses FastAPI. Import from 'fastapi' instead.",
+}
+
+
+# Parsed ASTs keyed by sha256 of the source, so re-validating unchanged files
+# (every save/deploy of a multi-file app) skips ast.parse. Kept small since
+# a tree for a 100KB file is large; the lock covers validation running in
+# threadpool workers.
+_AST_CACHE_SIZE = 32
+_ast_cache: "OrderedDict[bytes, ast.Module]" = OrderedDict()
+_ast_cache_lock = threading.Lock()
+
+
+def _parse_cached(code: str) -> ast.Module:
+    """Parse code, reusing the tree from a previous call with identical source.
+
+    Raises SyntaxError exactly like ast.parse; failed parses are not cached.
+    """
+    key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).digest()
+    with _ast_cache_lock:
+        tree = _ast_cache.get(key)
+        if tree is not None:
+            _ast_cache.move_to_end(key)
+            return tree
+    # Parsed outside the lock so threads don't serialize on ast.parse
+    tree = ast.parse(code)
+    with _ast_cache_lock:
+        _ast_cache[key] = tree
+        if len(_ast_cache) > _AST_CACHE_SIZE:
+            _ast_cache.popitem(last=False)
+    return tree
+
+
+# Call names rejected via AST (case-sensitive to avoid FastHTML Input)
+_FORBIDDEN_CALL_NAMES = frozenset({"input", "raw_input"})
+_FASTHTML_FACTORIES = ("fast_app", "FastHTML")
+
+
+def _app_framework(node: ast.Assign) -> Optional[str]:
+    """Return 'fastapi' or 'fasthtml' if the assignment creates `app`, else None."""
+    if not isinstance(node.value, ast.Call):
+        return None
+    func = node.value.func
+    func_name = func.id if isinstance(func, ast.Name) else None
+    for target in node.targets:
+        if isinstance(target, ast.Name) and target.id == 'app':
+            if func_name == 'FastAPI':
+                return 'fastapi'
+            if func_name in _FASTHTML_FACTORIES:
+                return 'fasthtml'
+        elif isinstance(target, ast.Tuple) and func_name in _FASTHTML_FACTORIES:
+            for elt in target.elts:
+                if isinstance(elt, ast.Name) and elt.id == 'app':
+                    return 'fasthtml'
     return None
 
 
+def _top_level_assigns(tree: ast.Module) -> Iterable[ast.Assign]:
+    """Module-level assignments, plus those one level inside if/try blocks.
+
+    The app is almost always created here, so this is checked before
+    walking function, class and loop bodies.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            yield node
+        elif isinstance(node, (ast.If, ast.Try)):
+            blocks = [node.body, node.orelse]
+            if isinstance(node, ast.Try):
+                blocks.extend(handler.body for handler in node.handlers)
+                blocks.append(node.finalbody)
+            for block in blocks:
+                for child in block:
+                    if isinstance(child, ast.Assign):
+                        yield child
+
+
+def _all_assigns(tree: ast.Module) -> Iterable[ast.Assign]:
+    """Every assignment in the module, at any depth."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            yield node
+
+
+def _app_frameworks(tree: ast.Module) -> Set[str]:
+    """Frameworks of the app assignments in the module.
+
+    Uses the cheap top-level scan when it finds one, and otherwise falls back
+    to a full walk, so apps built in factories, loops or nested blocks are
+    still found.
+    """
+    frameworks = {fw for fw in map(_app_framework, _top_level_assigns(tree)) if fw}
+    if not frameworks:
+        frameworks = {fw for fw in map(_app_framework, _all_assigns(tree)) if fw}
+    return frameworks
+
+
+def _has_app(tree: ast.Module) -> bool:
+    """Return True if the module creates an app (FastAPI or FastHTML)."""
+    return any(_app_framework(node) for node in _top_level_assigns(tree)) or any(
+        _app_framework(node) for node in _all_assigns(tree)
+    )
+
+
+def _top_package(name: str) -> str:
+    """Top-level package of a dotted module name ('urllib.parse' -> 'urllib')."""
+    dot = name.find('.')
+    return name if dot < 0 else name[:dot]
+
+
+def _scan_tree(
+    tree: ast.AST, allowed: Set[str]
+) -> tuple[Optional[tuple[str, int]], Optional[tuple[str, int]]]:
+    """Walk the AST once for import and forbidden-call checks.
+
+    Returns (bad_import, forbidden_call), each the (name, line) of the first
+    offender in walk order, or None.
+    """
+    bad_import = None
+    forbidden_call = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if (forbidden_call is None and isinstance(node.func, ast.Name)
+                    and node.func.id in _FORBIDDEN_CALL_NAMES):
+                forbidden_call = node.func.id, node.lineno
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                module_name = _top_package(alias.name)
+                if module_name not in allowed:
+                    bad_import = module_name, node.lineno
+                    break
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                module_name = _top_package(node.module)
+                if module_name not in allowed:
+                    bad_import = module_name, node.lineno
+        # An import error outranks any forbidden call, so nothing left to find
+        if bad_import is not None:
+            break
+    return bad_import, forbidden_call
+
+
 def detect_framework_from_code(code: str) -> str:
     """Detect framework from code AST. Returns 'fastapi' or 'fasthtml'."""
     try:
-        tree = ast.parse(code)
+        tree = _parse_cached(code)
     except SyntaxError:
         return "fastapi"
-    has_fastapi_app = False
-    has_fasthtml_app = False
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            if not isinstance(node.value, ast.Call):
-                continue
-            func = node.value.func
-            func_name = func.id if isinstance(func, ast.Name) else None
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == "app":
-                    if func_name == "FastAPI":
-                        has_fastapi_app = True
-                    if func_name in ("fast_app", "FastHTML"):
-                        has_fasthtml_app = True
-                elif isinstance(target, ast.Tuple) and func_name in ("fast_app", "FastHTML"):
-                    for elt in target.elts:
-                        if isinstance(elt, ast.Name) and elt.id == "app":
-                            has_fasthtml_app = True
-    if has_fasthtml_app:
+    if "fasthtml" in _app_frameworks(tree):
         return "fasthtml"
-    if has_fastapi_app:
-        return "fastapi"
     return "fastapi"
 
 
@@ -86,17 +371,48 @@ def detect_framework_from_files(files: dict, entrypoint: str = "app.py") -> str:
 
 def _normalize_allowed_imports(
     allowed_imports_override: Optional[Iterable[str]]
-) -> Optional[Set[str]]:
+) -> Optional[FrozenSet[str]]:
+    """Lowercase and strip an allowed-imports override into a frozenset.
+
+    A frozenset is taken as already normalized, which lets validate_multifile
+    normalize once and hand the result to every per-file validation.
+    """
     if allowed_imports_override is None:
         return None
-    normalized = {
+    if isinstance(allowed_imports_override, frozenset):
+        return allowed_imports_override or None
+    normalized = frozenset(
         item.strip().lower()
         for item in allowed_imports_override
         if isinstance(item, str) and item.strip()
-    }
+    )
     return normalized or None
 
 
+@functools.lru_cache(maxsize=32)
+def _display_allowed(base_allowed: FrozenSet[str]) -> str:
+    """Sorted, comma-separated allowed imports for error messages."""
+    return ', '.join(sorted(base_allowed))
+
+
+@functools.lru_cache(maxsize=32)
+def _combined_allowed(
+    base_allowed: FrozenSet[str], local_modules: FrozenSet[str]
+) -> FrozenSet[str]:
+    """Allowed imports plus the app's own modules, built once per pair of sets."""
+    return base_allowed | local_modules
+
+
+def _reject_import(
+    module_name: str, line_num: int, base_allowed: FrozenSet[str]
+) -> tuple[bool, str, int]:
+    """Build the validation result for a disallowed import."""
+    # Provide helpful suggestions for common imports
+    hint = _IMPORT_SUGGESTIONS.get(module_name.lower())
+    suggestion_text = f" {hint}" if hint else ""
+    return False, f"Import '{module_name}' is not allowed.{suggestion_text} Allowed imports: {_display_allowed(base_allowed)}", line_num
+
+
 def validate_code(
     code: str,
     local_modules: Optional[set] = None,
@@ -110,15 +426,24 @@ def validate_code(
         local_modules: Set of module names that are local to this multi-file app
                       (e.g., {'routes', 'models'} for files routes.py, models.py)
     """
-    if local_modules is None:
-        local_modules = set()
+    local_modules = frozenset(local_modules or ())
     # Check for empty code
     if not code or not code.strip():
         return False, "Code cannot be empty. Please write some Python code.", None
-    
+
+    # Checks run cheapest first and fail fast: empty check, substring-prefiltered
+    # token scan, then ast.parse, then a single AST walk. Keep this order so
+    # obviously bad code is rejected without paying for a parse.
+
+    # Check for forbidden constructs with better error messages
+    forbidden = _find_forbidden(code)
+    if forbidden:
+        rule, line_num = forbidden
+        return False, _FORBIDDEN_MESSAGES[rule], line_num
+
     # Basic syntax check
     try:
-        tree = ast.parse(code)
+        tree = _parse_cached(code)
     except SyntaxError as e:
         # Provide more helpful syntax error messages
         error_msg = e.msg
@@ -131,67 +456,22 @@ def validate_code(
             error_msg = f"Syntax error: {e.msg}"
         return False, error_msg, e.lineno
 
-    # Check that an app is created (FastAPI or FastHTML)
-    has_fastapi_app = False
-    has_fasthtml_app = False
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            if not isinstance(node.value, ast.Call):
-                continue
-            func = node.value.func
-            func_name = func.id if isinstance(func, ast.Name) else None
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == 'app':
-                    if func_name == 'FastAPI':
-                        has_fastapi_app = True
-                    if func_name in ('fast_app', 'FastHTML'):
-                        has_fasthtml_app = True
-                elif isinstance(target, ast.Tuple) and func_name in ('fast_app', 'FastHTML'):
-                    for elt in target.elts:
-                        if isinstance(elt, ast.Name) and elt.id == 'app':
-                            has_fasthtml_app = True
-
-    if not (has_fastapi_app or has_fasthtml_app):
-        return False, "Your code must create an app instance. Add: app = FastAPI() (or app, rt = fast_app() for FastHTML)", None
-
-    # Security checks - check imports
     # Combine allowed imports with local modules for multi-file apps
     base_allowed = _normalize_allowed_imports(allowed_imports_override) or ALLOWED_IMPORTS
-    allowed = base_allowed | local_modules
+    allowed = _combined_allowed(base_allowed, local_modules)
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                module_name = alias.name.split('.')[0]
-                if module_name not in allowed:
-                    # Provide helpful suggestions for common imports
-                    suggestions = []
-                    if 'requests' in module_name.lower():
-                        suggestions.append("Use urllib.parse for URL handling instead")
-                    elif 'pandas' in module_name.lower() or 'numpy' in module_name.lower():
-                        suggestions.append("Data processing libraries are not available. Use built-in Python types.")
-                    elif 'flask' in module_name.lower() or 'django' in module_name.lower():
-                        suggestions.append("This platform uses FastAPI. Import from 'fastapi' instead.")
-
-                    suggestion_text = f" {suggestions[0]}" if suggestions else ""
-                    return False, f"Import '{module_name}' is not allowed.{suggestion_text} Allowed imports: {', '.join(sorted(base_allowed))}", node.lineno
-        elif isinstance(node, ast.ImportFrom):
-            if node.module:
-                module_name = node.module.split('.')[0]
-                if module_name not in allowed:
-                    suggestions = []
-                    if 'requests' in module_name.lower():
-                        suggestions.append("Use urllib.parse for URL handling instead")
-                    elif 'pandas' in module_name.lower() or 'numpy' in module_name.lower():
-                        suggestions.append("Data processing libraries are not available. Use built-in Python types.")
-                    elif 'flask' in module_name.lower() or 'django' in module_name.lower():
-                        suggestions.append("This platform uses FastAPI. Import from 'fastapi' instead.")
+    # Check that an app is created (FastAPI or FastHTML)
+    if not _has_app(tree):
+        return False, "Your code must create an app instance. Add: app = FastAPI() (or app, rt = fast_app() for FastHTML)", None
 
-                    suggestion_text = f" {suggestions[0]}" if suggestions else ""
-                    return False, f"Import '{module_name}' is not allowed.{suggestion_text} Allowed imports: {', '.join(sorted(base_allowed))}", node.lineno
+    # Single AST pass: imports and forbidden calls
+    bad_import, forbidden_call = _scan_tree(tree, allowed)
+
+    # Security checks - check imports
+    if bad_import:
+        return _reject_import(*bad_import, base_allowed)
 
     # Check for forbidden call names (case-sensitive to avoid FastHTML Input)
-    forbidden_call = find_forbidden_calls(tree, {"input", "raw_input"})
     if forbidden_call:
         name, line_num = forbidden_call
         message = "input() is not allowed. Use FastAPI request parameters instead."
@@ -199,28 +479,6 @@ def validate_code(
             message = "raw_input() is not allowed. Use FastAPI request parameters instead."
         return False, message, line_num
 
-    # Check for forbidden patterns with better error messages
-    # Use \b word boundary to avoid false positives (e.g., urlopen matching open)
-    # Note: Import-based restrictions are handled by allowed_imports, not here
-    forbidden_patterns_map = {
-        r'__import__': "Direct use of __import__() is not allowed for security reasons.",
-        r'\beval\s*\(': "eval() is not allowed for security reasons. Use proper code structure instead.",
-        r'\bexec\s*\(': "exec() is not allowed for security reasons. Use proper code structure instead.",
-        r'\bcompile\s*\(': "compile() is not allowed for security reasons.",
-        r'\bopen\s*\(': "File operations are not allowed. Use environment variables or in-memory data instead.",
-        r'\bfile\s*\(': "File operations are not allowed. Use environment variables or in-memory data instead.",
-        r'\bsubprocess\b': "subprocess is not allowed for security reasons.",
-        r'os\.system': "os.system() is not allowed for security reasons.",
-        r'os\.popen': "os.popen() is not allowed for security reasons.",
-    }
-    
-    for pattern, friendly_msg in forbidden_patterns_map.items():
-        match = re.search(pattern, code, re.IGNORECASE)
-        if match:
-            # Find line number of the match
-            line_num = code[:match.start()].count('\n') + 1
-            return False, friendly_msg, line_num
-
     return True, None, None
 
 
@@ -237,16 +495,22 @@ def validate_code_syntax_only(
         code: The Python code to validate
         local_modules: Set of module names that are local to this multi-file app
     """
-    if local_modules is None:
-        local_modules = set()
+    local_modules = frozenset(local_modules or ())
 
     # Check for empty code
     if not code or not code.strip():
         return False, "Code cannot be empty.", None
 
+    # Same cheapest-first ordering as validate_code
+    # Check for forbidden constructs
+    forbidden = _find_forbidden(code)
+    if forbidden:
+        rule, line_num = forbidden
+        return False, _FORBIDDEN_SHORT_MESSAGES[rule], line_num
+
     # Basic syntax check
     try:
-        tree = ast.parse(code)
+        tree = _parse_cached(code)
     except SyntaxError as e:
         error_msg = e.msg
         if "invalid syntax" in error_msg.lower():
@@ -261,22 +525,15 @@ def validate_code_syntax_only(
     # Security checks - check imports
     # Combine allowed imports with local modules for multi-file apps
     base_allowed = _normalize_allowed_imports(allowed_imports_override) or ALLOWED_IMPORTS
-    allowed = base_allowed | local_modules
+    allowed = _combined_allowed(base_allowed, local_modules)
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                module_name = alias.name.split('.')[0]
-                if module_name not in allowed:
-                    return False, f"Import '{module_name}' is not allowed. Allowed imports: {', '.join(sorted(base_allowed))}", node.lineno
-        elif isinstance(node, ast.ImportFrom):
-            if node.module:
-                module_name = node.module.split('.')[0]
-                if module_name not in allowed:
-                    return False, f"Import '{module_name}' is not allowed. Allowed imports: {', '.join(sorted(base_allowed))}", node.lineno
+    # Single AST pass: imports and forbidden calls
+    bad_import, forbidden_call = _scan_tree(tree, allowed)
+
+    if bad_import:
+        return _reject_import(*bad_import, base_allowed)
 
     # Check for forbidden call names (case-sensitive to avoid FastHTML Input)
-    forbidden_call = find_forbidden_calls(tree, {"input", "raw_input"})
     if forbidden_call:
         name, line_num = forbidden_call
         message = "input() is not allowed."
@@ -284,38 +541,34 @@ def validate_code_syntax_only(
             message = "raw_input() is not allowed."
         return False, message, line_num
 
-    # Check for forbidden patterns
-    # Use \b word boundary to avoid false positives (e.g., urlopen matching open)
-    # Note: Import-based restrictions are handled by allowed_imports, not here
-    forbidden_patterns_map = {
-        r'__import__': "Direct use of __import__() is not allowed for security reasons.",
-        r'\beval\s*\(': "eval() is not allowed for security reasons.",
-        r'\bexec\s*\(': "exec() is not allowed for security reasons.",
-        r'\bcompile\s*\(': "compile() is not allowed for security reasons.",
-        r'\bopen\s*\(': "File operations are not allowed.",
-        r'\bfile\s*\(': "File operations are not allowed.",
-        r'\bsubprocess\b': "subprocess is not allowed for security reasons.",
-        r'os\.system': "os.system() is not allowed for security reasons.",
-        r'os\.popen': "os.popen() is not allowed for security reasons.",
-    }
-
-    for pattern, friendly_msg in forbidden_patterns_map.items():
-        match = re.search(pattern, code, re.IGNORECASE)
-        if match:
-            line_num = code[:match.start()].count('\n') + 1
-            return False, friendly_msg, line_num
-
     return True, None, None
 
 
+def _validate_python_file(
+    job: Tuple[str, bool, FrozenSet[str], Optional[FrozenSet[str]]]
+) -> Tuple[bool, Optional[str], Optional[int]]:
+    """Validate one file of a multi-file app. Module-level so it can run in a process pool."""
+    content, is_entrypoint, local_modules, allowed_imports_override = job
+    if is_entrypoint:
+        # Entrypoint must define an app
+        return validate_code(content, local_modules, allowed_imports_override)
+    # Other Python files: syntax and security only, no app required
+    return validate_code_syntax_only(content, local_modules, allowed_imports_override)
+
+
 def validate_multifile(
     files: Dict[str, str],
     entrypoint: str = "app.py",
-    allowed_imports_override: Optional[Iterable[str]] = None
+    allowed_imports_override: Optional[Iterable[str]] = None,
+    executor=None
 ) -> Tuple[bool, str, Optional[int], Optional[str]]:
     """
     Validate all files in a multi-file app.
     Returns: (is_valid, error_message, error_line, error_file)
+
+    Per-file checks are independent, so an optional concurrent.futures
+    executor can run them in parallel. The first failure in file order is
+    reported either way.
     """
     # Guardrails
     MAX_FILES = 50
@@ -328,59 +581,63 @@ def validate_multifile(
     if len(files) > MAX_FILES:
         return False, f"Too many files (max {MAX_FILES})", None, None
 
-    total_size = sum(len(content) for content in files.values())
-    if total_size > MAX_TOTAL_SIZE:
-        return False, f"Total size exceeds {MAX_TOTAL_SIZE // 1024}KB", None, None
-
     if entrypoint not in files:
         return False, f"Entrypoint '{entrypoint}' not found in files", None, None
 
     if not entrypoint.endswith('.py'):
         return False, f"Entrypoint must be a Python file (.py), got: {entrypoint}", None, None
 
+    # Normalize the override once for all files
+    allowed_imports_override = _normalize_allowed_imports(allowed_imports_override)
+
     # Build set of local module names (file names without .py extension)
     # This allows imports between files in the same multi-file app
-    local_modules = {
+    local_modules = frozenset(
         filename[:-3]  # Remove .py extension
         for filename in files.keys()
         if filename.endswith('.py')
-    }
+    )
 
-    # Validate each file
+    # Structural checks on every file first (type, size, running total), so a
+    # bad submission is rejected at the first offending file, before any parse
+    total_size = 0
     for filename, content in files.items():
         ext = os.path.splitext(filename)[1].lower()
 
-        if ext == '.py':
-            if len(content) > MAX_FILE_SIZE:
-                return False, f"File too large: {filename} (max {MAX_FILE_SIZE // 1024}KB)", None, filename
-
-            if filename == entrypoint:
-                # Entrypoint must define an app
-                is_valid, error_msg, error_line = validate_code(
-                    content,
-                    local_modules,
-                    allowed_imports_override
-                )
-            else:
-                # Other Python files: syntax and security only, no app required
-                is_valid, error_msg, error_line = validate_code_syntax_only(
-                    content,
-                    local_modules,
-                    allowed_imports_override
-                )
-
-            if not is_valid:
-                return False, error_msg, error_line, filename
-
-        elif ext in STATIC_EXTENSIONS:
-            # Static files: size only, no AST validation
-            if len(content) > MAX_FILE_SIZE:
-                return False, f"File too large: {filename} (max {MAX_FILE_SIZE // 1024}KB)", None, filename
-
-        else:
+        if ext != '.py' and ext not in STATIC_EXTENSIONS:
             return False, (
                 f"File type not allowed: {filename}. "
                 f"Allowed: .py, .css, .js, .svg, .html, .json, .txt"
             ), None, filename
 
+        size = len(content)
+        if size > MAX_FILE_SIZE:
+            return False, f"File too large: {filename} (max {MAX_FILE_SIZE // 1024}KB)", None, filename
+
+        total_size += size
+        if total_size > MAX_TOTAL_SIZE:
+            return False, f"Total size exceeds {MAX_TOTAL_SIZE // 1024}KB", None, None
+
+    # Validate each Python file; static files need no AST validation.
+    # Identical contents (empty __init__.py, shared stubs) are validated once.
+    validated = set()
+    pending = []
+    for filename, content in files.items():
+        if not filename.lower().endswith('.py'):
+            continue
+
+        is_entrypoint = filename == entrypoint
+        key = (hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest(), is_entrypoint)
+        if key in validated:
+            continue
+        validated.add(key)
+        pending.append((filename, (content, is_entrypoint, local_modules, allowed_imports_override)))
+
+    # The builtin map is lazy, so without an executor we stop at the first failure
+    jobs = [job for _, job in pending]
+    results = executor.map(_validate_python_file, jobs) if executor else map(_validate_python_file, jobs)
+    for (filename, _), (is_valid, error_msg, error_line) in zip(pending, results):
+        if not is_valid:
+            return False, error_msg, error_line, filename
+
     return True, "", None, None
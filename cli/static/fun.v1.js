@@ -0,0 +1,96 @@
+async function getFortune() {
+    const res = await fetch('/fortune').then(r => r.json());
+    document.getElementById('fortune-result').innerHTML = 
+        `${res.fortune}<br><span class="lucky-nums">Lucky numbers: ${res.lucky_numbers.join(', ')}</span>`;
+}
+
+async function ask8Ball() {
+    const q = document.getElementById('question').value || 'Will I be lucky today?';
+    const res = await fetch(`/8ball?question=${encodeURIComponent(q)}`).then(r => r.json());
+    document.getElementById('8ball-result').innerHTML = `<strong>"${res.question}"</strong><br><br>🎱 ${res.answer}`;
+}
+
+async function getJoke() {
+    const res = await fetch('/joke').then(r => r.json());
+    document.getElementById('joke-result').textContent = res.joke;
+}
+
+async function rollDice() {
+    const count = document.getElementById('dice-count').value || 2;
+    const sides = document.getElementById('dice-sides').value || 6;
+    const res = await fetch(`/roll?count=${count}&sides=${sides}`).then(r => r.json());
+    document.getElementById('dice-result').innerHTML = 
+        `<strong>${res.dice}</strong>: [${res.rolls.join(', ')}]<br>Total: <strong>${res.total}</strong>`;
+}
+
+async function flipCoin() {
+    const el = document.getElementById('flip-result');
+    el.innerHTML = '<span class="emoji-big">🪙</span>';
+    el.style.transition = 'transform 0.5s';
+    el.style.transform = 'rotateY(720deg)';
+    await new Promise(r => setTimeout(r, 500));
+    const res = await fetch('/flip').then(r => r.json());
+    el.innerHTML = `<span class="emoji-big">${res.emoji}</span><br>${res.result}!`;
+    el.style.transform = 'rotateY(0deg)';
+}
+
+async function getRandomNumber() {
+    const min = document.getElementById('rand-min').value || 1;
+    const max = document.getElementById('rand-max').value || 100;
+    const res = await fetch(`/random-number?min=${min}&max=${max}`).then(r => r.json());
+    document.getElementById('random-result').innerHTML = `<span style="font-size:2rem;font-weight:bold">${res.number}</span><br>(${res.range})`;
+}
+
+async function getRoast() {
+    const res = await fetch('/roast').then(r => r.json());
+    document.getElementById('roast-result').innerHTML = `${res.roast}<p class="disclaimer">${res.disclaimer}</p>`;
+}
+
+async function getCompliment() {
+    const res = await fetch('/compliment').then(r => r.json());
+    document.getElementById('compliment-result').textContent = res.compliment;
+    confetti();
+}
+
+async function playRPS(choice) {
+    const res = await fetch(`/rps?choice=${choice}`).then(r => r.json());
+    const el = document.getElementById('rps-result');
+    el.innerHTML = `${res.you} vs ${res.cpu}<br><strong>${res.message}</strong>`;
+    if (res.result === 'win') confetti();
+}
+
+async function getPassword() {
+    const len = document.getElementById('pw-length').value || 16;
+    const sym = document.getElementById('pw-symbols').checked;
+    const res = await fetch(`/password?length=${len}&symbols=${sym}`).then(r => r.json());
+    const el = document.getElementById('password-result');
+    el.innerHTML = `${res.password}<br><span style="color:#48dbfb;">Strength: ${res.strength}</span>`;
+    navigator.clipboard.writeText(res.password).catch(()=>{});
+}
+
+async function getWYR() {
+    const res = await fetch('/would-you-rather').then(r => r.json());
+    document.getElementById('wyr-result').innerHTML = 
+        `<strong>Would you rather...</strong><br><br>
+         🅰️ ${res.option_a}<br><em>or</em><br>🅱️ ${res.option_b}?`;
+}
+
+function confetti() {
+    const container = document.getElementById('confetti-container');
+    const colors = ['#ff6b6b','#feca57','#48dbfb','#ff9ff3','#1dd1a1','#5f27cd'];
+    for (let i = 0; i < 50; i++) {
+        const c = document.createElement('div');
+        c.style.cssText = `
+            position:fixed; width:10px; height:10px; 
+            background:${colors[Math.floor(Math.random()*colors.length)]};
+            left:${Math.random()*100}vw; top:-10px; border-radius:50%;
+            animation: fall ${1+Math.random()*2}s ease-out forwards;
+            opacity:${0.5+Math.random()*0.5};
+        `;
+        container.appendChild(c);
+        setTimeout(() => c.remove(), 3000);
+    }
+}
+
+// Enter key support for 8-ball
+document.getElementById('question').addEventListener('keypress', e => { if(e.key === 'Enter') ask8Ball(); });
@@ -0,0 +1,80 @@
+"""Tests for the vendored code validator (kept identical to backend/validation.py)."""
+from fp_cli.validation import validate_code
+
+APP = "from fastapi import FastAPI\napp = FastAPI()\n"
+
+
+def test_dunder_import_in_string_literal_is_rejected():
+    code = APP + "x = getattr(__builtins__, '__import__')('os')\n"
+    assert validate_code(code) == (
+        False, "Direct use of __import__() is not allowed for security reasons.", 3
+    )
+
+
+def test_subprocess_in_string_literal_is_rejected():
+    code = APP + "import importlib\nm = importlib.import_module('subprocess')\n"
+    assert validate_code(code) == (
+        False, "subprocess is not allowed for security reasons.", 4
+    )
+
+
+def test_subprocess_as_part_of_a_word_in_string_is_allowed():
+    assert validate_code(APP + "s = 'subprocessing'\n") == (True, None, None)
+
+
+def test_forbidden_names_are_case_sensitive():
+    assert validate_code(APP + "EVAL(1)\n") == (True, None, None)
+    assert validate_code(APP + "Open('x')\n") == (True, None, None)
+
+
+def test_forbidden_call_is_rejected():
+    assert validate_code(APP + "\nx = eval('1')\n") == (
+        False,
+        "eval() is not allowed for security reasons. Use proper code structure instead.",
+        4,
+    )
+
+
+def test_forbidden_call_inside_fstring_is_rejected():
+    assert validate_code(APP + "x = f\"{open('/etc/passwd').read()}\"\n") == (
+        False,
+        "File operations are not allowed. Use environment variables or in-memory data instead.",
+        3,
+    )
+
+
+def test_forbidden_call_text_in_plain_string_is_allowed():
+    assert validate_code(APP + "s = 'eval(1)'  # open(x)\n") == (True, None, None)
+
+
+def _accepts(body):
+    return validate_code("from fastapi import FastAPI\n" + body) == (True, None, None)
+
+
+def test_app_at_module_level_is_found():
+    assert _accepts("app = FastAPI()\n")
+
+
+def test_app_from_factory_function_is_found():
+    assert _accepts("def create_app():\n    app = FastAPI()\n    return app\n\napp = create_app()\n")
+
+
+def test_app_created_in_loop_is_found():
+    assert _accepts("for _ in range(1):\n    app = FastAPI()\n")
+
+
+def test_app_created_in_nested_blocks_is_found():
+    assert _accepts(
+        "if True:\n    try:\n        if True:\n            app = FastAPI()\n"
+        "    except Exception:\n        pass\n"
+    )
+
+
+def test_app_created_in_class_body_is_found():
+    assert _accepts("class C:\n    app = FastAPI()\n\napp = C.app\n")
+
+
+def test_missing_app_is_rejected():
+    ok, message, _ = validate_code("x = 1\n")
+    assert not ok
+    assert message.startswith("Your code must create an app instance.")
@@ -4,14 +4,16 @@ Entrypoint for FastAPI runner container
 Reads user code from ConfigMap and executes it safely
 Supports both single-file and multi-file apps
 """
+import asyncio
+import collections
+import hashlib
+import marshal
 import os
 import sys
-import time
 import threading
-import queue
 import logging
-import importlib.util
-from pathlib import Path
+import re
+from datetime import datetime, timezone
 
 logger = logging.getLogger("runner")
 
@@ -19,13 +21,40 @@ CODE_PATH = os.getenv("CODE_PATH", "/code/main.py")
 CODE_DIR = os.path.dirname(CODE_PATH)
 APP_ID = os.getenv("APP_ID", "unknown")
 PLATFORM_MONGO_URI = os.getenv("PLATFORM_MONGO_URI", "")
+# Compiled user code is cached here, keyed by source hash, for warm restarts.
+# The platform points this at an emptyDir volume, which survives container
+# restarts; the /tmp default only helps when the runner is reused in place.
+CODE_CACHE_DIR = os.getenv("CODE_CACHE_DIR", "/tmp")
+# compile() optimize level for user code. 0 keeps asserts and docstrings,
+# which FastAPI turns into endpoint descriptions; 2 strips both.
+CODE_OPTIMIZE = int(os.getenv("CODE_OPTIMIZE", "0"))
 
 # Add code directory to Python path for multi-file imports
 # This enables: from models import Item, from services import get_items, etc.
 if CODE_DIR not in sys.path:
     sys.path.insert(0, CODE_DIR)
 
-# Paths to skip for request logging
+# Any of these in the source means it defines an app. Plain substring
+# searches are far cheaper than a regex scan, so the whitespace-tolerant
+# FastAPI assignment pattern only runs once its literal tail is present.
+_APP_MARKERS = (b"fast_app(", b"FastHTML(")
+_FASTAPI_MARKER = b"FastAPI("
+_FASTAPI_ASSIGN = re.compile(rb"app\s*=\s*FastAPI\(")
+
+# Probes hit /health constantly; its messages are built once and reused
+_HEALTH_BODY_BYTES = b'{"status":"healthy"}'
+_HEALTH_START = {
+    "type": "http.response.start",
+    "status": 200,
+    # A tuple, so the shared message can't be extended in place downstream
+    "headers": (
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_HEALTH_BODY_BYTES)).encode()),
+    ),
+}
+_HEALTH_BODY = {"type": "http.response.body", "body": _HEALTH_BODY_BYTES}
+
+# Paths to skip for request logging (/health is answered by the middleware)
 _SKIP_LOG_PATHS = frozenset({"/health", "/docs", "/redoc", "/openapi.json"})
 
 
@@ -37,16 +66,22 @@ class RequestLogWriter:
     """Background thread that batch-writes request logs to MongoDB.
 
     Completely fault-tolerant: never raises, never blocks the caller.
-    Uses a Queue with maxsize to apply backpressure (drops if full).
+    Logs go into a bounded deque, whose appends take no Python-level lock;
+    once max_queue logs are pending the oldest are dropped, so the logs that
+    survive an outage are the most recent. The writer wakes every
+    flush_interval, or early once a full batch is waiting.
     """
 
-    def __init__(self, mongo_uri, app_id, batch_size=50, flush_interval=5.0):
+    def __init__(self, mongo_uri, app_id, batch_size=500, flush_interval=5.0, max_queue=10_000):
         self.mongo_uri = mongo_uri
         self.app_id = app_id
         self.batch_size = batch_size
         self.flush_interval = flush_interval
-        self._queue = queue.Queue(maxsize=1000)
+        self.max_queue = max_queue
+        self._buffer = collections.deque(maxlen=max_queue)
+        self._wake = threading.Event()
         self._collection = None
+        self._indexed = False
 
     def start(self):
         if not self.mongo_uri:
@@ -56,55 +91,76 @@ class RequestLogWriter:
         t.start()
 
     def log(self, doc):
-        """Enqueue a log document. Drops silently if queue is full."""
-        try:
-            self._queue.put_nowait(doc)
-        except queue.Full:
-            pass
+        """Enqueue a log document. Drops the oldest silently if the buffer is full."""
+        buffer = self._buffer
+        buffer.append(doc)
+        # is_set() is a plain read; set() takes the event's lock, so it's
+        # only called once per batch
+        if len(buffer) >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
 
     def _get_collection(self):
+        # The client and handle are created once: pymongo reconnects on its
+        # own, so a failed write doesn't need a new client
         if self._collection is None:
             try:
-                from pymongo import MongoClient, ASCENDING, DESCENDING
-                client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
+                from pymongo import MongoClient
+                client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000, maxPoolSize=4)
                 db = client.get_default_database()
                 self._collection = db["_platform_request_logs"]
-                # Create indexes (idempotent)
-                self._collection.create_index(
-                    "timestamp", expireAfterSeconds=604800, background=True
-                )
-                self._collection.create_index(
-                    [("app_id", ASCENDING), ("timestamp", DESCENDING)], background=True
-                )
-                logger.info("Request log collection initialized with indexes")
             except Exception as e:
                 logger.warning(f"Failed to init request log collection: {e}")
-                self._collection = None
+                return None
+        if not self._indexed:
+            self._ensure_indexes()
         return self._collection
 
+    def _ensure_indexes(self):
+        """Create indexes (idempotent); retried with the next batch until it succeeds."""
+        try:
+            from pymongo import ASCENDING, DESCENDING
+            self._collection.create_index(
+                "timestamp", expireAfterSeconds=604800, background=True
+            )
+            self._collection.create_index(
+                [("app_id", ASCENDING), ("timestamp", DESCENDING)], background=True
+            )
+            self._indexed = True
+            logger.info("Request log collection initialized with indexes")
+        except Exception as e:
+            logger.warning(f"Failed to create request log indexes: {e}")
+
     def _run(self):
+        # Connect and index up front so the first batch doesn't pay for it
+        self._get_collection()
+        buffer = self._buffer
+        popleft = buffer.popleft
         while True:
-            batch = []
-            try:
-                item = self._queue.get(timeout=self.flush_interval)
-                batch.append(item)
-            except queue.Empty:
-                continue
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
 
-            # Drain remaining items up to batch_size
-            while len(batch) < self.batch_size:
+            # Drain everything pending, batch_size docs at a time
+            while buffer:
+                batch = []
                 try:
-                    batch.append(self._queue.get_nowait())
-                except queue.Empty:
-                    break
+                    while len(batch) < self.batch_size:
+                        batch.append(popleft())
+                except IndexError:
+                    pass
 
-            try:
-                collection = self._get_collection()
-                if collection is not None and batch:
-                    collection.insert_many(batch, ordered=False)
-            except Exception as e:
-                logger.warning(f"Failed to write request logs: {e}")
-                self._collection = None  # Reset to retry connection
+                for doc in batch:
+                    qs = doc.get("query_string")
+                    if type(qs) is bytes:
+                        doc["query_string"] = qs.decode("utf-8", errors="replace") if qs else ""
+
+                try:
+                    collection = self._get_collection()
+                    if collection is not None:
+                        collection.insert_many(
+                            batch, ordered=False, bypass_document_validation=True
+                        )
+                except Exception as e:
+                    logger.warning(f"Failed to write request logs: {e}")
 
 
 # Global writer instance (initialized in main())
@@ -115,51 +171,91 @@ _log_writer = None
 # Request Logging ASGI Middleware
 # =============================================================================
 
-def add_request_logging_middleware(app):
+class _StatusRecordingSend:
+    """ASGI send that remembers the response status.
+
+    A slotted instance per request is cheaper than a fresh closure plus a
+    nonlocal cell.
+    """
+    __slots__ = ("send", "status")
+
+    def __init__(self, send):
+        self.send = send
+        self.status = 500  # Default if response never starts
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        await self.send(message)
+
+
+def add_request_logging_middleware(app, writer, docs_body=None):
     """ASGI middleware that logs request method, path, status, and duration.
 
+    Also answers /health for Kubernetes probes, before any logging, and
+    serves docs_body (a pre-rendered /docs page) when given, so the runner
+    adds a single ASGI layer in front of the app.
     Pure ASGI (not BaseHTTPMiddleware) to avoid response body buffering.
-    Writes are non-blocking via the background RequestLogWriter.
+    Writes are non-blocking via the background RequestLogWriter; with no
+    writer, requests pass straight through without being timed.
     """
+    docs_start, docs_bodies = _docs_messages(docs_body) if docs_body is not None else (None, None)
+
+    # The server runs a single event loop; its clock is bound on the first
+    # timed request and reused after that
+    loop_time = None
+
     async def middleware(scope, receive, send):
-        if scope.get("type") != "http":
+        nonlocal loop_time
+        # Keys the ASGI spec guarantees are indexed directly
+        if scope["type"] != "http":
             await app(scope, receive, send)
             return
 
-        path = scope.get("path", "")
+        path = scope["path"]
+        # One set lookup covers /health and the unlogged paths, so ordinary
+        # requests pay for a single membership test. An == chain over the
+        # four paths only ties on /health and is ~3x slower for everything
+        # else, which is what the set is optimised for.
         if path in _SKIP_LOG_PATHS:
+            if path == "/health":
+                await send(_HEALTH_START)
+                await send(_HEALTH_BODY)
+                return
+            if path == "/docs" and docs_bodies is not None:
+                message = docs_bodies.get(scope["method"])
+                if message is not None:
+                    await send(docs_start)
+                    await send(message)
+                    return
+            await app(scope, receive, send)
+            return
+        if writer is None:
             await app(scope, receive, send)
             return
 
-        start = time.monotonic()
-        status_code = 500  # Default if response never starts
-
-        async def send_wrapper(message):
-            nonlocal status_code
-            if message.get("type") == "http.response.start":
-                status_code = message.get("status", 500)
-            await send(message)
+        if loop_time is None:
+            loop_time = asyncio.get_running_loop().time
+        start = loop_time()
+        send_wrapper = _StatusRecordingSend(send)
 
         try:
             await app(scope, receive, send_wrapper)
         except Exception:
-            status_code = 500
+            send_wrapper.status = 500
             raise
         finally:
-            if _log_writer is not None:
-                from datetime import datetime, timezone
-                doc = {
-                    "app_id": APP_ID,
-                    "timestamp": datetime.now(timezone.utc),
-                    "method": scope.get("method", ""),
-                    "path": path,
-                    "query_string": scope.get("query_string", b"").decode(
-                        "utf-8", errors="replace"
-                    ),
-                    "status_code": status_code,
-                    "duration_ms": round((time.monotonic() - start) * 1000, 2),
-                }
-                _log_writer.log(doc)
+            doc = {
+                "app_id": APP_ID,
+                "timestamp": datetime.now(timezone.utc),
+                "method": scope["method"],
+                "path": path,
+                # Raw bytes; RequestLogWriter decodes off the event loop
+                "query_string": scope["query_string"],
+                "status_code": send_wrapper.status,
+                "duration_ms": round((loop_time() - start) * 1000, 2),
+            }
+            writer.log(doc)
 
     return middleware
 
@@ -170,21 +266,56 @@ def add_request_logging_middleware(app):
 
 def load_user_code():
     """Load and validate user code"""
-    if not os.path.exists(CODE_PATH):
+    # Kept as bytes: compile() takes them directly (honouring any PEP 263
+    # coding line), so the source is never decoded into a second copy
+    try:
+        f = open(CODE_PATH, 'rb')
+    except FileNotFoundError:
         print(f"Error: Code file not found at {CODE_PATH}", file=sys.stderr)
         sys.exit(1)
-
-    with open(CODE_PATH, 'r') as f:
+    with f:
         code = f.read()
 
     # Basic validation
-    if 'app = FastAPI(' not in code and 'fast_app(' not in code and 'FastHTML(' not in code:
+    if not (
+        any(marker in code for marker in _APP_MARKERS)
+        or (_FASTAPI_MARKER in code and _FASTAPI_ASSIGN.search(code))
+    ):
         print("Error: Code must define an app instance (FastAPI or FastHTML)", file=sys.stderr)
         sys.exit(1)
 
     return code
 
-def execute_code(code: str):
+def compile_cached(code):
+    """Compile user code, reusing a marshalled code object from an earlier start.
+
+    The cache key covers the source, its path, the optimize level and the
+    interpreter's bytecode tag, so a stale or foreign entry is never loaded.
+    Cache I/O errors just fall back to compiling.
+    """
+    key = hashlib.blake2b(code, digest_size=16)
+    key.update(CODE_PATH.encode())
+    key.update(b"O%d" % CODE_OPTIMIZE)
+    key.update(sys.implementation.cache_tag.encode())
+    cache_path = os.path.join(CODE_CACHE_DIR, f"fp_compiled_{key.hexdigest()}.marshal")
+    try:
+        with open(cache_path, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code_obj = compile(code, CODE_PATH, 'exec', optimize=CODE_OPTIMIZE)
+    try:
+        # Write then rename, so a concurrent start never reads a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(code_obj, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return code_obj
+
+def execute_code(code):
     """Execute user code in isolated namespace"""
     # Create a clean namespace for execution
     user_globals = {
@@ -210,7 +341,7 @@ def execute_code(code: str):
     })
 
     try:
-        exec(compile(code, CODE_PATH, 'exec'), user_globals)
+        exec(compile_cached(code), user_globals)
     except Exception as e:
         import traceback
         print(f"Error executing user code: {e}", file=sys.stderr)
@@ -226,26 +357,133 @@ def execute_code(code: str):
 
 
 # =============================================================================
-# Health & Swagger Middleware
+# Swagger Middleware
 # =============================================================================
 
-def add_health_wrapper(app):
-    """Add /health endpoint for Kubernetes probes"""
+def _patch_swagger_html(body):
+    """Point Swagger UI at openapi.json relative to the page, not the root."""
+    return (
+        body.replace(b"url: '/openapi.json'", b"url: 'openapi.json'")
+        .replace(b'url: "/openapi.json"', b'url: "openapi.json"')
+    )
+
+
+def add_swagger_patch_wrapper(app):
+    """Rewrite the /docs page so Swagger UI works behind a stripped path prefix.
+
+    Pure ASGI: every other request is passed straight through, and only the
+    /docs response is buffered.
+    """
     async def wrapped(scope, receive, send):
-        if scope.get("type") == "http" and scope.get("path") == "/health":
-            await send({
-                "type": "http.response.start",
-                "status": 200,
-                "headers": [(b"content-type", b"application/json")],
-            })
-            await send({
-                "type": "http.response.body",
-                "body": b'{"status":"healthy"}',
-            })
+        if scope["type"] != "http" or scope["path"] != "/docs":
+            await app(scope, receive, send)
             return
-        await app(scope, receive, send)
+
+        start = None
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = start.get("headers", [])
+            content_type = next((v for k, v in headers if k.lower() == b"content-type"), b"")
+            if start["status"] == 200 and (b"text/html" in content_type or body.startswith(b"<!")):
+                body = _patch_swagger_html(body)
+                headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+                headers.append((b"content-length", str(len(body)).encode()))
+                start = {**start, "headers": headers}
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await app(scope, receive, send_wrapper)
     return wrapped
 
+def render_docs_html(app):
+    """Render FastAPI's Swagger UI page for app, patched, as bytes."""
+    from fastapi.openapi.docs import get_swagger_ui_html
+
+    root = app.root_path.rstrip("/")
+    oauth2_redirect_url = app.swagger_ui_oauth2_redirect_url
+    if oauth2_redirect_url:
+        oauth2_redirect_url = root + oauth2_redirect_url
+    response = get_swagger_ui_html(
+        openapi_url=root + app.openapi_url,
+        title=app.title + " - Swagger UI",
+        oauth2_redirect_url=oauth2_redirect_url,
+        init_oauth=app.swagger_ui_init_oauth,
+        swagger_ui_parameters=app.swagger_ui_parameters,
+    )
+    return _patch_swagger_html(response.body)
+
+
+def _docs_messages(body):
+    """Build the ASGI messages that serve a pre-rendered /docs page.
+
+    Built once, like the /health messages; bodies is keyed by method.
+    """
+    start = {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": (
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ),
+    }
+    bodies = {
+        "GET": {"type": "http.response.body", "body": body},
+        "HEAD": {"type": "http.response.body", "body": b""},
+    }
+    return start, bodies
+
+
+# =============================================================================
+# Static Files
+# =============================================================================
+
+# Versioned asset names (app.v2.css, app.3f2a9c1b.js) never change content.
+# A hash must contain a letter, so dated names like report.20240115.csv
+# are not mistaken for one.
+_VERSIONED_ASSET = re.compile(r"\.(?:v\d+|(?=[0-9a-f]*[a-f])[0-9a-f]{8,})\.[^./]+$")
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+def _serves_static(app):
+    """True if the app has its own /static mount or routes under /static/."""
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if path == "/static" or path.startswith("/static/"):
+            return True
+    return False
+
+
+def make_static_files(directory):
+    """StaticFiles that lets browsers keep versioned assets for a year.
+
+    Anything without a version in its name is revalidated on every load.
+    """
+    from starlette.staticfiles import StaticFiles
+
+    class CachedStaticFiles(StaticFiles):
+        def file_response(self, full_path, stat_result, scope, status_code=200):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            if _VERSIONED_ASSET.search(os.path.basename(full_path)):
+                response.headers["Cache-Control"] = _IMMUTABLE_CACHE
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+            return response
+
+    return CachedStaticFiles(directory=directory)
+
 
 # =============================================================================
 # Main
@@ -261,14 +499,23 @@ def main():
     app = execute_code(code)
 
     # Mount /code/static at /static if directory exists (ConfigMap keys like static/styles.css create it)
-    code_dir = Path(CODE_PATH).parent
-    static_dir = code_dir / "static"
-    if static_dir.is_dir():
-        from starlette.staticfiles import StaticFiles
-        app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    # Skipped when the app already serves /static itself; its routes win.
+    static_dir = os.path.join(CODE_DIR, "static")
+    if os.path.isdir(static_dir) and not _serves_static(app):
+        app.mount("/static", make_static_files(static_dir), name="static")
         logger.info("Static files mounted at /static")
 
+    docs_body = None
     if hasattr(app, "docs_url") and hasattr(app, "add_middleware"):
+        # FastAPI's own page can be served pre-rendered, in front of the app,
+        # only if the app serves it at /docs itself and has no middleware
+        # (auth and the like) that must see the request first. Checked before
+        # the defaults below, which don't add routes to an existing app.
+        cache_docs = (
+            app.docs_url == "/docs"
+            and app.openapi_url is not None
+            and not getattr(app, "user_middleware", None)
+        )
         if app.docs_url is None:
             app.docs_url = "/docs"
         if getattr(app, "redoc_url", None) is None:
@@ -278,45 +525,27 @@ def main():
 
         # Patch Swagger UI to use correct path for OpenAPI schema
         # Since Traefik strips the path prefix, we need Swagger UI to load openapi.json
-        # relative to the current path, not from root
-        from starlette.middleware.base import BaseHTTPMiddleware
-        from fastapi.responses import HTMLResponse
-
-        class SwaggerUIPatchMiddleware(BaseHTTPMiddleware):
-            async def dispatch(self, request, call_next):
-                response = await call_next(request)
-                if request.url.path == "/docs" and response.status_code == 200:
-                    body = b""
-                    if hasattr(response, 'body_iterator'):
-                        async for chunk in response.body_iterator:
-                            body += chunk
-                    elif hasattr(response, 'body'):
-                        body = response.body if isinstance(response.body, bytes) else response.body.encode('utf-8')
-
-                    content_type = response.headers.get('content-type', '')
-                    if 'text/html' in content_type or body.startswith(b'<!'):
-                        html = body.decode('utf-8')
-                        html = html.replace("url: '/openapi.json'", "url: 'openapi.json'")
-                        html = html.replace('url: "/openapi.json"', 'url: "openapi.json"')
-                        new_headers = dict(response.headers)
-                        new_headers.pop('content-length', None)
-                        return HTMLResponse(content=html, status_code=response.status_code, headers=new_headers)
-                return response
-
-        app.add_middleware(SwaggerUIPatchMiddleware)
-
-    # Middleware wrapping order (outermost first):
-    # health wrapper -> request logging -> SwaggerUI patch -> user app
-    # This means /health is intercepted before reaching request logging.
-    app = add_request_logging_middleware(app)
-    app = add_health_wrapper(app)
-
+        # relative to the current path, not from root.
+        # FastAPI's own docs page only depends on app settings, so it is
+        # rendered and patched once and served by the logging middleware;
+        # anything else the app answers at /docs is patched live.
+        if cache_docs:
+            docs_body = render_docs_html(app)
+        else:
+            app = add_swagger_patch_wrapper(app)
+
+    # Middleware wrapping order (outermost first), all plain ASGI callables:
+    # health + cached /docs + request logging -> [/docs patch] -> user app
+    # /health and the cached /docs page are answered in that one layer,
+    # without entering the user app's middleware stack.
     # Start request log writer background thread
     if PLATFORM_MONGO_URI:
         _log_writer = RequestLogWriter(PLATFORM_MONGO_URI, APP_ID)
         _log_writer.start()
         print("Request logging enabled")
 
+    app = add_request_logging_middleware(app, _log_writer, docs_body)
+
     print("Starting uvicorn server...")
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)